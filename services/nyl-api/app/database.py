@@ -1,8 +1,18 @@
+import asyncio
+import logging
 import os
+import random
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+import orjson
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+LOGGER = logging.getLogger(__name__)
+_random = random.SystemRandom()
+
 
 def build_database_url() -> str:
     url = os.getenv("DATABASE_URL")
@@ -15,25 +25,114 @@ def build_database_url() -> str:
     return f"postgresql://{user}:{password}@{host}:5432/{db}"
 
 
+_ASYNC_URL_PREFIXES = (
+    ("postgresql+asyncpg://", "postgresql+asyncpg://"),
+    ("postgresql://", "postgresql+asyncpg://"),
+    ("postgres://", "postgresql+asyncpg://"),
+)
+
+
 def to_async_url(url: str) -> str:
-    if url.startswith("postgresql+asyncpg://"):
-        return url
-    if url.startswith("postgresql://"):
-        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    if url.startswith("postgres://"):
-        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    for prefix, replacement in _ASYNC_URL_PREFIXES:
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
     return url
 
 
+def _json_serializer(value: Any) -> str:
+    # SQLAlchemy's asyncpg codec expects str from the serializer.
+    return orjson.dumps(value).decode()
+
+
 DATABASE_URL = to_async_url(build_database_url())
+POOL_SIZE = int(os.getenv("POOL_SIZE", "20"))
+MAX_OVERFLOW = int(os.getenv("MAX_OVERFLOW", "40"))
+POOL_RECYCLE = int(os.getenv("POOL_RECYCLE", "1800"))
+POOL_TIMEOUT = float(os.getenv("POOL_TIMEOUT", "30"))
+# Connections opened by startup_db before the app takes traffic (<= POOL_SIZE).
+POOL_WARM_SIZE = min(int(os.getenv("POOL_WARM_SIZE", str(POOL_SIZE))), POOL_SIZE)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1200"))
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "2048"))
+PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("PREPARED_STATEMENT_CACHE_SIZE", "1024"))
+DB_CONNECT_DELAY = float(os.getenv("DB_CONNECT_DELAY", "0.5"))
+DB_CONNECT_MAX_DELAY = float(os.getenv("DB_CONNECT_MAX_DELAY", "10"))
+DB_CONNECT_DEADLINE = float(os.getenv("DB_CONNECT_DEADLINE", "60"))
+# Server-side limits (ms) so one runaway query or abandoned transaction cannot
+# pin a pooled connection; 0 disables either.
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", "10000"))
 
-engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_recycle=POOL_RECYCLE,
+    pool_timeout=POOL_TIMEOUT,
+    # Reuse the most recently returned connection so a small hot set serves
+    # steady traffic and the rest can age out via pool_recycle.
+    pool_use_lifo=True,
+    query_cache_size=QUERY_CACHE_SIZE,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    connect_args={
+        # asyncpg's own statement LRU, and SQLAlchemy's adapter-level cache of
+        # prepared statements per connection.
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "jit": "off",
+            "application_name": "nyl-api",
+            "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS),
+            "idle_in_transaction_session_timeout": str(DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+        },
+    },
+)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+# Reads run on autocommit connections from the same pool, so a GET costs one
+# round trip instead of BEGIN / SELECT / ROLLBACK.
+ReadSessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"), expire_on_commit=False
+)
+
+
+async def _prime_pool() -> None:
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(
+        *(_ping() for _ in range(POOL_WARM_SIZE)), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 
 async def startup_db() -> None:
-    async with engine.begin() as conn:
-        await conn.execute(text("SELECT 1"))
+    """Open every pooled connection up front so early requests skip the connect cost.
+
+    Retries with capped exponential backoff and full jitter until
+    DB_CONNECT_DEADLINE, so replicas restarting together do not retry in lockstep.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DB_CONNECT_DEADLINE
+    attempt = 0
+    while True:
+        try:
+            await _prime_pool()
+            return
+        except (OSError, SQLAlchemyError) as exc:
+            attempt += 1
+            delay = _random.uniform(
+                0, min(DB_CONNECT_MAX_DELAY, DB_CONNECT_DELAY * 2 ** (attempt - 1))
+            )
+            if loop.time() + delay > deadline:
+                raise
+            LOGGER.warning(
+                "Database not ready (attempt %s): %s; retrying in %.2fs", attempt, exc, delay
+            )
+            await asyncio.sleep(delay)
 
 
 async def shutdown_db() -> None:
@@ -43,3 +142,22 @@ async def shutdown_db() -> None:
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
+
+
+async def get_read_session() -> AsyncSession:
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def gather_read(*calls: Callable[[AsyncSession], Awaitable[Any]]) -> list[Any]:
+    """Run independent read helpers concurrently, each on its own read session.
+
+    A session only checks out a connection on first execute, so calls that are
+    served from a cache never touch the pool.
+    """
+
+    async def _run(call: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with ReadSessionLocal() as session:
+            return await call(session)
+
+    return list(await asyncio.gather(*(_run(call) for call in calls)))
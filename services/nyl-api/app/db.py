@@ -1,41 +1,77 @@
 from __future__ import annotations
 
+import hashlib
+import os
+from collections.abc import Sequence
 from datetime import date
+from functools import lru_cache
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+import orjson
+from sqlalchemy import (
+    RowMapping,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    literal_column,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .cache import TTLCache
 from .models import JournalEntry, JournalTask
+from .repositories.base import row_to_dict
 
+ENTRY_CACHE_SIZE = int(os.getenv("ENTRY_CACHE_SIZE", "4096"))
+ENTRY_CACHE_TTL = float(os.getenv("ENTRY_CACHE_TTL", "30"))
 
-def _entry_to_dict(entry: JournalEntry) -> dict[str, Any]:
-    return {
-        "id": entry.id,
-        "created_at": entry.created_at,
-        "journal_date": entry.journal_date,
-        "scope": entry.scope,
-        "title": entry.title,
-        "body": entry.body,
-        "tags": entry.tags,
-        "is_deleted": entry.is_deleted,
-        "deleted_at": entry.deleted_at,
-        "embedding_model": entry.embedding_model,
-        "content_hash": entry.content_hash,
-    }
-
-
-def _task_to_dict(task: JournalTask) -> dict[str, Any]:
-    return {
-        "id": task.id,
-        "entry_id": task.entry_id,
-        "created_at": task.created_at,
-        "text": task.text,
-        "done": task.done,
-        "sort_order": task.sort_order,
-    }
+# Keyed by entry id. Every write path in this module refreshes or evicts the
+# entry it touches, so hits never outlive a write made through this process.
+_entry_cache = TTLCache(maxsize=ENTRY_CACHE_SIZE, ttl=ENTRY_CACHE_TTL)
+
+
+_ENTRY_COLUMNS = (
+    JournalEntry.id,
+    JournalEntry.created_at,
+    JournalEntry.journal_date,
+    JournalEntry.scope,
+    JournalEntry.title,
+    JournalEntry.body,
+    JournalEntry.tags,
+    JournalEntry.is_deleted,
+    JournalEntry.deleted_at,
+    JournalEntry.embedding_model,
+    JournalEntry.content_hash,
+)
+_entry_to_dict = row_to_dict(_ENTRY_COLUMNS)
+
+
+_TASK_COLUMNS = (
+    JournalTask.id,
+    JournalTask.entry_id,
+    JournalTask.created_at,
+    JournalTask.text,
+    JournalTask.done,
+    JournalTask.sort_order,
+)
+_task_to_dict = row_to_dict(_TASK_COLUMNS)
+
+
+def _body_hash(body: dict[str, Any]) -> bytes:
+    return hashlib.blake2b(
+        orjson.dumps(body, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).digest()
 
 
 async def create_journal_entry(
@@ -46,40 +82,81 @@ async def create_journal_entry(
     title: str | None,
     body: dict[str, Any],
     tags: list[str] | None,
-) -> dict[str, Any]:
-    entry = JournalEntry(
-        id=uuid4(),
-        journal_date=journal_date,
-        scope=scope,
-        title=title,
-        body=body,
-        tags=tags,
+) -> dict[str, Any] | None:
+    """Insert a new entry; None if one already exists for this scope and day."""
+    stmt = (
+        pg_insert(JournalEntry)
+        .values(
+            id=uuid4(),
+            journal_date=journal_date,
+            scope=scope,
+            title=title,
+            body=body,
+            body_hash=_body_hash(body),
+            tags=tags,
+        )
+        .on_conflict_do_nothing(index_elements=[JournalEntry.scope, JournalEntry.journal_date])
+        .returning(*_ENTRY_COLUMNS)
     )
-    session.add(entry)
-    try:
-        await session.commit()
-    except IntegrityError:
-        await session.rollback()
-        raise
-    await session.refresh(entry)
-    return _entry_to_dict(entry)
+    result = await session.execute(stmt)
+    row = result.one_or_none()
+    await session.commit()
+    if row is None:
+        return None
+    entry = _entry_to_dict(row)
+    _entry_cache.set(entry["id"], dict(entry))
+    return entry
+
+
+async def create_journal_entries(
+    *, session: AsyncSession, entries: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Insert many entries, skipping any scope/day that already has one.
+
+    Returns only the entries that were created.
+    """
+    if not entries:
+        return []
+    stmt = (
+        pg_insert(JournalEntry)
+        .on_conflict_do_nothing(index_elements=[JournalEntry.scope, JournalEntry.journal_date])
+        .returning(*_ENTRY_COLUMNS)
+    )
+    params = [
+        {
+            "id": uuid4(),
+            "journal_date": entry["journal_date"],
+            "scope": entry["scope"],
+            "title": entry.get("title"),
+            "body": entry["body"],
+            "body_hash": _body_hash(entry["body"]),
+            "tags": entry.get("tags"),
+        }
+        for entry in entries
+    ]
+    # SQLAlchemy batches this into multi-row INSERT ... RETURNING statements
+    # ("insertmanyvalues") rather than one round trip per entry.
+    result = await session.execute(stmt, params)
+    created = [_entry_to_dict(row) for row in result.all()]
+    await session.commit()
+    for entry in created:
+        _entry_cache.set(entry["id"], dict(entry))
+    return created
 
 
 async def list_journal_entries(
     *, session: AsyncSession, scope: str, limit: int, status: str = "active"
-) -> list[dict[str, Any]]:
-    filters = [JournalEntry.scope == scope]
+) -> Sequence[RowMapping]:
+    stmt = lambda_stmt(lambda: select(*_ENTRY_COLUMNS).where(JournalEntry.scope == scope))
     if status == "active":
-        filters.append(JournalEntry.is_deleted.is_(False))
+        stmt += lambda s: s.where(JournalEntry.is_deleted.is_(False))
     elif status == "deleted":
-        filters.append(JournalEntry.is_deleted.is_(True))
-    result = await session.execute(
-        select(JournalEntry)
-        .where(*filters)
-        .order_by(JournalEntry.journal_date.desc(), JournalEntry.created_at.desc())
-        .limit(limit)
-    )
-    return [_entry_to_dict(entry) for entry in result.scalars().all()]
+        stmt += lambda s: s.where(JournalEntry.is_deleted.is_(True))
+    stmt += lambda s: s.order_by(
+        JournalEntry.journal_date.desc(), JournalEntry.created_at.desc()
+    ).limit(limit)
+    result = await session.execute(stmt)
+    return result.mappings().all()
 
 
 async def list_journal_scopes(*, session: AsyncSession) -> list[str]:
@@ -98,7 +175,7 @@ async def list_journal_entry_markers(
     start_date: date,
     end_date: date,
     scope: str | None = None,
-) -> list[dict[str, Any]]:
+) -> Sequence[RowMapping]:
     query = (
         select(
             JournalEntry.journal_date,
@@ -115,34 +192,42 @@ async def list_journal_entry_markers(
     if scope:
         query = query.where(JournalEntry.scope == scope)
     result = await session.execute(query)
-    return [
-        {"journal_date": row.journal_date, "scope": row.scope, "count": row.count}
-        for row in result.all()
-    ]
+    return result.mappings().all()
 
 
 async def get_journal_entry(
     session: AsyncSession, entry_id: UUID, include_deleted: bool = False
 ) -> dict[str, Any] | None:
-    filters = [JournalEntry.id == entry_id]
+    cached = _entry_cache.get(entry_id)
+    if cached is not None:
+        if cached["is_deleted"] and not include_deleted:
+            return None
+        return dict(cached)
+    stmt = lambda_stmt(lambda: select(*_ENTRY_COLUMNS).where(JournalEntry.id == entry_id))
     if not include_deleted:
-        filters.append(JournalEntry.is_deleted.is_(False))
-    result = await session.execute(select(JournalEntry).where(*filters))
-    entry = result.scalar_one_or_none()
-    return _entry_to_dict(entry) if entry else None
+        stmt += lambda s: s.where(JournalEntry.is_deleted.is_(False))
+    result = await session.execute(stmt)
+    row = result.one_or_none()
+    if row is None:
+        return None
+    data = _entry_to_dict(row)
+    _entry_cache.set(entry_id, data)
+    return dict(data)
 
 
 async def get_journal_entry_by_date(
     *, session: AsyncSession, scope: str, journal_date: date, include_deleted: bool = False
 ) -> dict[str, Any] | None:
-    filters = [JournalEntry.scope == scope, JournalEntry.journal_date == journal_date]
-    if not include_deleted:
-        filters.append(JournalEntry.is_deleted.is_(False))
-    result = await session.execute(
-        select(JournalEntry).where(*filters)
+    stmt = lambda_stmt(
+        lambda: select(*_ENTRY_COLUMNS).where(
+            JournalEntry.scope == scope, JournalEntry.journal_date == journal_date
+        )
     )
-    entry = result.scalar_one_or_none()
-    return _entry_to_dict(entry) if entry else None
+    if not include_deleted:
+        stmt += lambda s: s.where(JournalEntry.is_deleted.is_(False))
+    result = await session.execute(stmt)
+    row = result.one_or_none()
+    return _entry_to_dict(row) if row else None
 
 
 async def ensure_journal_entry(
@@ -153,99 +238,211 @@ async def ensure_journal_entry(
     title: str | None,
     body: dict[str, Any],
     tags: list[str] | None,
-) -> dict[str, Any]:
-    entry = JournalEntry(
-        id=uuid4(),
+) -> tuple[dict[str, Any], bool, bool]:
+    """Get or create the entry for a scope and day.
+
+    A soft-deleted entry is revived with the new content. Returns the entry and
+    whether it was inserted or revived.
+    """
+    new_id = uuid4()
+    stmt = pg_insert(JournalEntry).values(
+        id=new_id,
         journal_date=journal_date,
         scope=scope,
         title=title,
         body=body,
+        body_hash=_body_hash(body),
         tags=tags,
     )
-    session.add(entry)
-    try:
-        await session.commit()
-        await session.refresh(entry)
-        return _entry_to_dict(entry)
-    except IntegrityError:
-        await session.rollback()
-    result = await session.execute(
-        select(JournalEntry).where(
-            JournalEntry.scope == scope, JournalEntry.journal_date == journal_date
+    # Only a soft-deleted row is updated, so a live row is neither written nor
+    # locked; the second branch returns it instead, all in one round trip.
+    ins = stmt.on_conflict_do_update(
+        index_elements=[JournalEntry.scope, JournalEntry.journal_date],
+        set_={
+            "is_deleted": False,
+            "title": stmt.excluded.title,
+            "body": stmt.excluded.body,
+            "body_hash": stmt.excluded.body_hash,
+            "tags": stmt.excluded.tags,
+        },
+        where=JournalEntry.is_deleted,
+    ).returning(*_ENTRY_COLUMNS).cte("ins")
+    existing = select(*_ENTRY_COLUMNS, literal(False).label("written")).where(
+        JournalEntry.scope == scope,
+        JournalEntry.journal_date == journal_date,
+        ~exists().select_from(ins),
+    )
+    query = union_all(select(*ins.c, literal(True).label("written")), existing)
+    row = (await session.execute(query)).one_or_none()
+    await session.commit()
+    if row is None:
+        # A concurrent ensure committed the row after this statement's snapshot
+        # was taken, so the second branch could not see it; read it now.
+        data = await get_journal_entry_by_date(
+            session=session, scope=scope, journal_date=journal_date, include_deleted=True
+        )
+        return data, False, False
+    data = _entry_to_dict(row)
+    _entry_cache.set(data["id"], dict(data))
+    # A revived row keeps its old id; only a fresh insert carries new_id.
+    inserted = data["id"] == new_id
+    return data, inserted, row.written and not inserted
+
+
+_UPDATABLE_ENTRY_FIELDS = ("title", "body", "tags")
+
+
+# Matches extract_journal_text: a Tiptap text node with a non-blank character.
+_HAS_TEXT_PATH = literal_column(
+    r"""'strict $.** ? (@.type == "text" && @.text like_regex "\\S")'::jsonpath"""
+)
+
+
+def _is_blank(title: Any, body: Any) -> Any:
+    """SQL for "no visible title and no body text", the prune-on-save test."""
+    return and_(
+        func.coalesce(title, "").op("!~")(literal_column(r"'\S'")),
+        ~func.coalesce(func.jsonb_path_exists(body, _HAS_TEXT_PATH), False),
+    )
+
+
+@lru_cache(maxsize=8)
+def _update_entry_statement(columns: frozenset[str]):
+    """Build the UPDATE for one set of changed columns.
+
+    Only a handful of column sets occur, so each shape is compiled once and
+    its SQL string, and the per-connection prepared statement, are reused.
+    An update that leaves the entry blank soft-deletes it in the same
+    statement and reports that through the ``is_blank`` column.
+    """
+    table = JournalEntry.__table__
+    values: dict[str, Any] = {name: bindparam(f"b_{name}") for name in sorted(columns)}
+    new_title = values["title"] if "title" in columns else table.c.title
+    new_body = table.c.body
+    if "body" in columns:
+        new_body = bindparam("b_body", type_=table.c.body.type)
+        # An identical body keeps the stored value, so Postgres reuses the
+        # existing TOAST data instead of writing the document again.
+        values["body"] = case(
+            (table.c.body_hash == bindparam("b_body_hash"), table.c.body),
+            else_=new_body,
         )
+        values["body_hash"] = bindparam("b_body_hash", type_=table.c.body_hash.type)
+    values["is_deleted"] = case((_is_blank(new_title, new_body), True), else_=table.c.is_deleted)
+    return (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(values)
+        .returning(*_ENTRY_COLUMNS, _is_blank(table.c.title, table.c.body).label("is_blank"))
     )
-    existing = result.scalar_one_or_none()
-    if existing is None:
-        raise RuntimeError("Failed to ensure journal entry")
-    if existing.is_deleted:
-        existing.is_deleted = False
-        existing.deleted_at = None
-        existing.title = title
-        existing.body = body
-        existing.tags = tags
-        await session.commit()
-        await session.refresh(existing)
-    return _entry_to_dict(existing)
 
 
 async def update_journal_entry(
     *, session: AsyncSession, entry_id: UUID, fields: dict[str, Any]
-) -> dict[str, Any] | None:
+) -> tuple[dict[str, Any] | None, bool]:
+    """Apply ``fields`` and return ``(entry, pruned)``.
+
+    ``pruned`` is True when the update left the entry blank and it was
+    soft-deleted along with it.
+    """
+    # Only known columns reach the statement builder, which also caps the
+    # statement cache above at seven shapes.
+    fields = {name: fields[name] for name in _UPDATABLE_ENTRY_FIELDS if name in fields}
     if not fields:
-        return await get_journal_entry(session, entry_id)
-    result = await session.execute(select(JournalEntry).where(JournalEntry.id == entry_id))
-    entry = result.scalar_one_or_none()
-    if entry is None:
-        return None
-    for key, value in fields.items():
-        setattr(entry, key, value)
+        return await get_journal_entry(session, entry_id), False
+    params = {f"b_{name}": value for name, value in fields.items()}
+    params["b_id"] = entry_id
+    if "body" in fields:
+        params["b_body_hash"] = _body_hash(fields["body"])
+    result = await session.execute(_update_entry_statement(frozenset(fields)), params)
+    row = result.one_or_none()
     await session.commit()
-    await session.refresh(entry)
-    return _entry_to_dict(entry)
-
-
-async def delete_journal_entry(session: AsyncSession, entry_id: UUID) -> bool:
-    result = await session.execute(select(JournalEntry).where(JournalEntry.id == entry_id))
-    entry = result.scalar_one_or_none()
-    if entry is None:
-        return False
-    entry.is_deleted = True
-    entry.deleted_at = func.now()
+    if row is None:
+        _entry_cache.pop(entry_id)
+        return None, False
+    data = _entry_to_dict(row)
+    if row.is_blank:
+        _entry_cache.pop(entry_id)
+        return data, True
+    _entry_cache.set(entry_id, dict(data))
+    return data, False
+
+
+async def delete_journal_entry(session: AsyncSession, entry_id: UUID) -> str | None:
+    """Soft-delete an entry and return its scope, or None if it doesn't exist."""
+    result = await session.execute(
+        update(JournalEntry)
+        .where(JournalEntry.id == entry_id)
+        .values(is_deleted=True)
+        .returning(JournalEntry.scope)
+        .execution_options(synchronize_session=False)
+    )
+    scope = result.scalar_one_or_none()
     await session.commit()
-    return True
+    _entry_cache.pop(entry_id)
+    return scope
 
 
 async def restore_journal_entry(session: AsyncSession, entry_id: UUID) -> dict[str, Any] | None:
-    result = await session.execute(select(JournalEntry).where(JournalEntry.id == entry_id))
-    entry = result.scalar_one_or_none()
+    result = await session.execute(
+        update(JournalEntry)
+        .where(JournalEntry.id == entry_id)
+        .values(is_deleted=False)
+        .returning(*_ENTRY_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    entry = result.mappings().one_or_none()
+    await session.commit()
     if entry is None:
+        _entry_cache.pop(entry_id)
         return None
-    entry.is_deleted = False
-    entry.deleted_at = None
-    await session.commit()
-    await session.refresh(entry)
-    return _entry_to_dict(entry)
+    data = dict(entry)
+    _entry_cache.set(entry_id, dict(data))
+    return data
 
 
 async def list_journal_tasks(
     *, session: AsyncSession, entry_id: UUID
-) -> list[dict[str, Any]]:
+) -> Sequence[RowMapping]:
     result = await session.execute(
-        select(JournalTask)
+        select(*_TASK_COLUMNS)
         .where(JournalTask.entry_id == entry_id)
         .order_by(JournalTask.sort_order.asc(), JournalTask.created_at.asc())
     )
-    return [_task_to_dict(task) for task in result.scalars().all()]
+    return result.mappings().all()
 
 
 async def create_journal_task(
-    *, session: AsyncSession, entry_id: UUID, text: str, sort_order: int
-) -> dict[str, Any]:
-    task = JournalTask(entry_id=entry_id, text=text, sort_order=sort_order)
-    session.add(task)
+    *, session: AsyncSession, entry_id: UUID, text: str, sort_order: int | None = None
+) -> dict[str, Any] | None:
+    """Insert a task in one statement; None if the entry is missing or deleted.
+
+    Without ``sort_order`` the task goes after the entry's current last task.
+    """
+    if sort_order is None:
+        order = (
+            select(func.coalesce(func.max(JournalTask.sort_order) + 1, 0))
+            .where(JournalTask.entry_id == entry_id)
+            .scalar_subquery()
+        )
+    else:
+        order = cast(literal(sort_order), JournalTask.sort_order.type)
+    # Explicit casts: bare parameters in a SELECT list would be typed as text.
+    source = select(
+        literal(uuid4(), JournalTask.id.type),
+        JournalEntry.id,
+        cast(literal(text), JournalTask.text.type),
+        cast(literal(False), JournalTask.done.type),
+        order,
+    ).where(JournalEntry.id == entry_id, JournalEntry.is_deleted.is_(False))
+    result = await session.execute(
+        insert(JournalTask)
+        .from_select(["id", "entry_id", "text", "done", "sort_order"], source)
+        .returning(*_TASK_COLUMNS)
+    )
+    task = result.mappings().one_or_none()
     await session.commit()
-    await session.refresh(task)
-    return _task_to_dict(task)
+    return dict(task) if task is not None else None
 
 
 async def update_journal_task(
@@ -253,31 +450,34 @@ async def update_journal_task(
 ) -> dict[str, Any] | None:
     if not fields:
         return await get_journal_task(session=session, task_id=task_id)
-    result = await session.execute(select(JournalTask).where(JournalTask.id == task_id))
-    task = result.scalar_one_or_none()
-    if task is None:
-        return None
-    for key, value in fields.items():
-        setattr(task, key, value)
+    result = await session.execute(
+        update(JournalTask)
+        .where(JournalTask.id == task_id)
+        .values(**fields)
+        .returning(*_TASK_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.one_or_none()
     await session.commit()
-    await session.refresh(task)
-    return _task_to_dict(task)
+    return _task_to_dict(task) if task else None
 
 
 async def delete_journal_task(session: AsyncSession, task_id: UUID) -> bool:
-    result = await session.execute(select(JournalTask).where(JournalTask.id == task_id))
-    task = result.scalar_one_or_none()
-    if task is None:
-        return False
-    await session.delete(task)
+    result = await session.execute(
+        delete(JournalTask)
+        .where(JournalTask.id == task_id)
+        .execution_options(synchronize_session=False)
+    )
     await session.commit()
-    return True
+    return result.rowcount > 0
 
 
 async def get_journal_task(
     *, session: AsyncSession, task_id: UUID
 ) -> dict[str, Any] | None:
-    result = await session.execute(select(JournalTask).where(JournalTask.id == task_id))
+    result = await session.execute(
+        lambda_stmt(lambda: select(JournalTask).where(JournalTask.id == task_id))
+    )
     task = result.scalar_one_or_none()
     return _task_to_dict(task) if task else None
 
@@ -287,74 +487,85 @@ async def search_journal_entries_by_vector(
     embedding: list[float],
     limit: int = 5,
     scope: str | None = None,
-) -> list[dict[str, Any]]:
-    """Search journal entries by cosine similarity, optionally filtered by scope."""
-    filters = [
-        JournalEntry.is_deleted.is_(False),
-        JournalEntry.embedding.isnot(None),
-    ]
+    ef_search: int | None = None,
+    statement_timeout_ms: int | None = None,
+) -> Sequence[RowMapping]:
+    """Search journal entries by cosine similarity, optionally filtered by scope.
+
+    The live-entry and scope filters sit in the same ORDER BY distance LIMIT
+    query the partial HNSW index serves. The index returns at most
+    ef_search candidates before the scope filter runs, so a scoped search
+    that comes back short is redone exactly over that scope's entries.
+    ``ef_search`` and ``statement_timeout_ms`` apply for the rest of the
+    session's transaction.
+    """
+    settings = {"hnsw.ef_search": ef_search, "statement_timeout": statement_timeout_ms}
+    settings = {name: value for name, value in settings.items() if value is not None}
+    if settings:
+        # SET cannot take bind parameters; set_config(..., is_local) can, and
+        # both settings go out in one round trip.
+        await session.execute(
+            select(*(func.set_config(name, str(value), True) for name, value in settings.items()))
+        )
+    distance = JournalEntry.embedding.cosine_distance(embedding)
+    filters = [JournalEntry.is_deleted.is_(False), JournalEntry.embedding.isnot(None)]
     if scope is not None:
         filters.append(JournalEntry.scope == scope)
-    result = await session.execute(
-        select(JournalEntry)
-        .where(*filters)
-        .order_by(JournalEntry.embedding.cosine_distance(embedding))
-        .limit(limit)
-    )
-    return [_entry_to_dict(e) for e in result.scalars().all()]
-
-
-async def update_journal_entry_embedding(
-    session: AsyncSession,
-    entry_id: UUID,
-    embedding: list[float],
-    embedding_model: str,
-    content_hash: str,
-) -> bool:
-    """Update embedding for a journal entry."""
-    result = await session.execute(
-        select(JournalEntry).where(JournalEntry.id == entry_id)
+    stmt = select(*_ENTRY_COLUMNS, JournalEntry.body_hash).where(*filters).limit(limit)
+    rows = (await session.execute(stmt.order_by(distance))).mappings().all()
+    if scope is not None and len(rows) < limit:
+        # Ordering by an expression other than the bare <=> keeps the planner
+        # off the HNSW index, so this scans the scope's rows exactly.
+        rows = (await session.execute(stmt.order_by(distance + 0))).mappings().all()
+    return rows
+
+
+_UPDATE_EMBEDDINGS = (
+    update(JournalEntry.__table__)
+    .where(JournalEntry.__table__.c.id == bindparam("b_id"))
+    .values(
+        embedding=bindparam("b_embedding"),
+        embedding_model=bindparam("b_embedding_model"),
+        content_hash=bindparam("b_content_hash"),
     )
-    entry = result.scalar_one_or_none()
-    if entry is None:
-        return False
-    entry.embedding = embedding
-    entry.embedding_model = embedding_model
-    entry.content_hash = content_hash
-    await session.commit()
-    return True
+)
 
 
-async def clear_journal_entry_embedding(
+async def update_journal_entry_embeddings(
     session: AsyncSession,
-    entry_id: UUID,
-) -> bool:
-    """Clear embedding for a journal entry (when content is empty)."""
-    result = await session.execute(
-        select(JournalEntry).where(JournalEntry.id == entry_id)
+    rows: list[dict[str, Any]],
+) -> None:
+    """Write a batch of embeddings in one executemany and commit once.
+
+    Each row carries ``id``, ``embedding``, ``embedding_model`` and
+    ``content_hash``; ``None`` values clear the embedding.
+    """
+    if not rows:
+        return
+    await session.execute(
+        _UPDATE_EMBEDDINGS,
+        [
+            {
+                "b_id": row["id"],
+                "b_embedding": row["embedding"],
+                "b_embedding_model": row["embedding_model"],
+                "b_content_hash": row["content_hash"],
+            }
+            for row in rows
+        ],
     )
-    entry = result.scalar_one_or_none()
-    if entry is None:
-        return False
-    entry.embedding = None
-    entry.embedding_model = None
-    entry.content_hash = None
     await session.commit()
-    return True
+    for row in rows:
+        _entry_cache.pop(row["id"])
 
 
-async def get_journal_entry_embedding_info(
+async def list_journal_entry_embedding_info(
     session: AsyncSession,
-    entry_id: UUID,
-) -> dict[str, Any] | None:
-    """Get embedding metadata for a journal entry."""
+    entry_ids: Sequence[UUID],
+) -> dict[UUID, RowMapping]:
+    """Get embedding metadata for several journal entries, keyed by id."""
     result = await session.execute(
-        select(JournalEntry).where(JournalEntry.id == entry_id)
+        select(JournalEntry.id, JournalEntry.content_hash, JournalEntry.embedding_model)
+        .where(JournalEntry.id.in_(entry_ids))
     )
-    entry = result.scalar_one_or_none()
-    if entry is None:
-        return None
-    return {
-        "content_hash": entry.content_hash,
-        "embedding_model": entry.embedding_model,
-    }
+    return {row["id"]: row for row in result.mappings()}
@@ -1,38 +1,40 @@
+import re
 from typing import Any
 
-
-def _append_text(chunks: list[str], text: str) -> None:
-    if text:
-        chunks.append(text)
-
-
-def _maybe_newline(chunks: list[str]) -> None:
-    if not chunks:
-        return
-    if not chunks[-1].endswith("\n"):
-        chunks.append("\n")
-
-
-def _walk_tiptap(node: dict[str, Any], chunks: list[str]) -> None:
-    node_type = node.get("type")
-    if node_type == "text":
-        _append_text(chunks, node.get("text", ""))
-        return
-    if node_type == "hardBreak":
-        chunks.append("\n")
-        return
-
-    for child in node.get("content", []) or []:
-        _walk_tiptap(child, chunks)
-
-    if node_type in {
-        "paragraph",
-        "heading",
-        "blockquote",
-        "codeBlock",
-        "listItem",
-    }:
-        _maybe_newline(chunks)
+_BLOCK_TYPES = frozenset({"paragraph", "heading", "blockquote", "codeBlock", "listItem"})
+# Pushed after a block's children so its trailing newline lands post-subtree.
+_BLOCK_END = object()
+_TRAILING_WS = re.compile(r"[^\S\n]+(?=\n)")
+
+
+def _walk_tiptap(root: dict[str, Any], chunks: list[str]) -> None:
+    append = chunks.append
+    stack: list[Any] = [root]
+    pop = stack.pop
+    push = stack.append
+    extend = stack.extend
+    block_types = _BLOCK_TYPES
+    while stack:
+        node = pop()
+        if node is _BLOCK_END:
+            if chunks and not chunks[-1].endswith("\n"):
+                append("\n")
+            continue
+        get = node.get
+        node_type = get("type")
+        if node_type == "text":
+            text = get("text", "")
+            if text:
+                append(text)
+            continue
+        if node_type == "hardBreak":
+            append("\n")
+            continue
+        if node_type in block_types:
+            push(_BLOCK_END)
+        content = get("content")
+        if content:
+            extend(reversed(content))
 
 
 def extract_journal_text(body: dict[str, Any] | None) -> str:
@@ -40,5 +42,4 @@ def extract_journal_text(body: dict[str, Any] | None) -> str:
         return ""
     chunks: list[str] = []
     _walk_tiptap(body, chunks)
-    text = "".join(chunks)
-    return "\n".join(line.rstrip() for line in text.splitlines()).strip()
+    return _TRAILING_WS.sub("", "".join(chunks)).strip()
@@ -1,18 +1,24 @@
 import asyncio
+import hashlib
 import os
+from collections.abc import Awaitable, Callable, Mapping
 from datetime import date, date as dt_date
 
+from typing import Annotated, Any
 from uuid import UUID
 
 import httpx
-from fastapi import Depends, FastAPI, HTTPException, Query, Response
+import orjson
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from sqlalchemy.exc import IntegrityError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .database import get_session, shutdown_db, startup_db
+from .database import gather_read, get_read_session, get_session, shutdown_db, startup_db
 from .db import (
+    create_journal_entries,
     create_journal_entry,
     delete_journal_entry,
     ensure_journal_entry,
@@ -30,10 +36,16 @@ from .db import (
     restore_journal_entry,
 )
 from .services import ChatService
-from .journal_text import extract_journal_text
-from .rag_db import create_ingest_job, get_ingest_job
-from .rag_ingest import DEFAULT_EMBEDDING_MODEL, enqueue_ingest, reindex_journal_entries
-from .rag_chat import apply_rag_context
+from .rag_db import create_ingest_job, get_ingest_job, mark_job_failed
+from .rag_ingest import (
+    DEFAULT_EMBEDDING_MODEL,
+    enqueue_ingest,
+    enqueue_reindex,
+    start_ingest_workers,
+    stop_ingest_workers,
+)
+from .rag_chat import apply_rag_context, clear_context_cache
+from .cache import TTLCache
 from .ollama import (
     chat,
     get_ollama_client,
@@ -63,9 +75,78 @@ from .schemas import (
     SCOPE_PATTERN,
 )
 
-app = FastAPI(title="Nyl API")
+app = FastAPI(title="Nyl API", default_response_class=ORJSONResponse)
+
+ScopeQuery = Annotated[str, Query(pattern=SCOPE_PATTERN)]
+OptionalScopeQuery = Annotated[str | None, Query(pattern=SCOPE_PATTERN)]
+
+POLL_CACHE_TTL = float(os.getenv("POLL_CACHE_TTL", "15"))
+# Serialized bodies and ETags for the journal scope list, which the UI polls
+# on every load. Journal writes that can change the scope list evict it.
+_poll_cache = TTLCache(maxsize=8, ttl=POLL_CACHE_TTL)
+
+
+def _row_encoder(model: type[BaseModel]) -> Callable[[Mapping[str, Any]], dict[str, Any]]:
+    """Project a trusted DB row onto ``model``'s response fields, filling defaults."""
+    fields = tuple((name, field.default) for name, field in model.model_fields.items())
+
+    def encode(row: Mapping[str, Any]) -> dict[str, Any]:
+        return {name: row.get(name, default) for name, default in fields}
+
+    return encode
+
+
+_encode_entry = _row_encoder(JournalEntry)
+_encode_marker = _row_encoder(JournalEntryMarker)
+_encode_task = _row_encoder(JournalTask)
+_encode_chat = _row_encoder(ChatSession)
+_encode_message = _row_encoder(ChatMessageRecord)
+
+
+def _json_response(content: Any, **kwargs: Any) -> Response:
+    # Hot read routes return rows our own queries produced, so they skip
+    # response-model validation and go straight to orjson; response_model
+    # stays on the decorators for the OpenAPI schema. OPT_UTC_Z matches
+    # pydantic's "Z" suffix for UTC timestamps.
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_UTC_Z),
+        media_type="application/json",
+        **kwargs,
+    )
+
+
+def _etag_json(body: bytes, etag: str, if_none_match: str | None) -> Response:
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def _body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+async def _cached_json(
+    key: str, load: Callable[[], Awaitable[Any]], if_none_match: str | None
+) -> Response:
+    """Serve ``load()`` from the poll cache, answering 304 on a matching ETag."""
+    cached = _poll_cache.get(key)
+    if cached is None:
+        body = orjson.dumps(await load(), option=orjson.OPT_UTC_Z)
+        cached = (_body_etag(body), body)
+        _poll_cache.set(key, cached)
+    etag, body = cached
+    return _etag_json(body, etag, if_none_match)
 
-cors_origins = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "").split(",") if origin.strip()]
+
+async def _tagged_json(load: Callable[[], Awaitable[Any]], if_none_match: str | None) -> Response:
+    """Serve ``load()`` with a content ETag, answering 304 when it matches."""
+    body = orjson.dumps(await load(), option=orjson.OPT_UTC_Z)
+    return _etag_json(body, _body_etag(body), if_none_match)
+
+
+cors_origins = [
+    origin for origin in map(str.strip, os.getenv("CORS_ALLOW_ORIGINS", "").split(",")) if origin
+]
 if cors_origins:
     allow_all = "*" in cors_origins
     app.add_middleware(
@@ -79,14 +160,15 @@ if cors_origins:
 
 @app.on_event("startup")
 async def startup() -> None:
-    await startup_ollama_client()
-    await startup_db()
+    # Independent; startup takes as long as the slower one (the DB warm-up).
+    await asyncio.gather(startup_ollama_client(), startup_db())
+    start_ingest_workers()
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
-    await shutdown_ollama_client()
-    await shutdown_db()
+    await stop_ingest_workers()
+    await asyncio.gather(shutdown_ollama_client(), shutdown_db())
 
 
 @app.get("/health")
@@ -94,16 +176,21 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+# The model list is already cached in ollama.py; these only add the ETag.
 @app.get("/v1/models")
-async def models(client: httpx.AsyncClient = Depends(get_ollama_client)) -> dict[str, object]:
-    return await list_models(client)
+async def models(
+    if_none_match: str | None = Header(default=None),
+    client: httpx.AsyncClient = Depends(get_ollama_client),
+) -> dict[str, object]:
+    return await _tagged_json(lambda: list_models(client), if_none_match)
 
 
 @app.get("/v1/models/embeddings")
 async def embedding_models(
+    if_none_match: str | None = Header(default=None),
     client: httpx.AsyncClient = Depends(get_ollama_client),
 ) -> dict[str, object]:
-    return await list_embedding_models(client)
+    return await _tagged_json(lambda: list_embedding_models(client), if_none_match)
 
 
 @app.post("/v1/chat/completions")
@@ -132,12 +219,13 @@ async def create_chat(
     session: AsyncSession = Depends(get_session),
 ):
     service = ChatService(session)
-    return await service.create_session(
+    chat_session = await service.create_session(
         title=request.title,
         model=request.model,
         system_prompt=request.system_prompt,
         scope=request.scope,
     )
+    return _json_response(_encode_chat(chat_session))
 
 
 @app.get("/v1/chats", response_model=list[ChatSession])
@@ -150,40 +238,76 @@ async def list_chats(
         raise HTTPException(status_code=400, detail="Invalid status filter")
     service = ChatService(session)
     await service.purge_deleted_sessions()
-    return await service.list_sessions(status=status, scope=scope, limit=200)
+    sessions = await service.list_sessions(status=status, scope=scope, limit=200)
+    return _json_response([_encode_chat(row) for row in sessions])
 
 
 @app.get("/v1/chats/{chat_id:uuid}", response_model=ChatSessionDetail)
 async def get_chat(
     chat_id: UUID,
     include_deleted: bool = Query(False),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     service = ChatService(session)
     result = await service.get_session_with_messages(chat_id, include_deleted=include_deleted)
     if result is None:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return result
+    return _json_response(
+        {
+            "session": _encode_chat(result["session"]),
+            "messages": [_encode_message(row) for row in result["messages"]],
+        }
+    )
+
+
+def _request_body(adapter: TypeAdapter) -> dict[str, Any]:
+    """openapi_extra documenting a body that the route validates itself."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": adapter.json_schema()}},
+        }
+    }
 
 
-@app.post("/v1/chats/{chat_id:uuid}/messages", response_model=list[ChatMessageRecord])
+async def _validate_body(adapter: TypeAdapter, request: Request) -> Any:
+    # The body is parsed and validated by pydantic-core in one pass over the
+    # raw bytes, instead of stdlib json + a model per item; errors keep
+    # FastAPI's 422 shape.
+    try:
+        return adapter.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+        ) from exc
+
+
+_MESSAGE_CREATE_LIST = TypeAdapter(list[ChatMessageCreate])
+
+
+@app.post(
+    "/v1/chats/{chat_id:uuid}/messages",
+    response_model=list[ChatMessageRecord],
+    openapi_extra=_request_body(_MESSAGE_CREATE_LIST),
+)
 async def create_chat_messages(
     chat_id: UUID,
-    request: list[ChatMessageCreate],
+    request: Request,
     model: str | None = Query(default=None),
     system_prompt: str | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
 ):
+    payload = await _validate_body(_MESSAGE_CREATE_LIST, request)
     service = ChatService(session)
     messages = await service.add_messages(
         chat_id,
-        [message.model_dump() for message in request],
+        _MESSAGE_CREATE_LIST.dump_python(payload),
         model=model,
         system_prompt=system_prompt,
     )
     if not messages:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return messages
+    return _json_response([_encode_message(row) for row in messages])
 
 
 @app.post("/v1/chats/{chat_id:uuid}/archive", response_model=ChatSession)
@@ -195,7 +319,7 @@ async def archive_chat(
     chat_session = await service.archive_session(chat_id)
     if chat_session is None:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return chat_session
+    return _json_response(_encode_chat(chat_session))
 
 
 @app.post("/v1/chats/{chat_id:uuid}/unarchive", response_model=ChatSession)
@@ -207,7 +331,7 @@ async def unarchive_chat(
     chat_session = await service.unarchive_session(chat_id)
     if chat_session is None:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return chat_session
+    return _json_response(_encode_chat(chat_session))
 
 
 @app.delete("/v1/chats/{chat_id:uuid}", response_model=ChatSession)
@@ -219,7 +343,7 @@ async def delete_chat(
     chat_session = await service.delete_session(chat_id)
     if chat_session is None:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return chat_session
+    return _json_response(_encode_chat(chat_session))
 
 
 @app.post("/v1/chats/{chat_id:uuid}/restore", response_model=ChatSession)
@@ -231,7 +355,7 @@ async def restore_chat(
     chat_session = await service.restore_session(chat_id)
     if chat_session is None:
         raise HTTPException(status_code=404, detail="Chat session not found")
-    return chat_session
+    return _json_response(_encode_chat(chat_session))
 
 
 @app.post("/v1/journal/entries", response_model=JournalEntry)
@@ -239,21 +363,43 @@ async def create_entry(
     request: JournalEntryCreate,
     session: AsyncSession = Depends(get_session),
 ):
-    try:
-        entry = await create_journal_entry(
-            session=session,
-            journal_date=request.journal_date,
-            scope=request.scope,
-            title=request.title,
-            body=request.body,
-            tags=request.tags,
-        )
-    except IntegrityError as exc:
-        raise HTTPException(
-            status_code=409, detail="Journal entry already exists for this day"
-        ) from exc
+    entry = await create_journal_entry(
+        session=session,
+        journal_date=request.journal_date,
+        scope=request.scope,
+        title=request.title,
+        body=request.body,
+        tags=request.tags,
+    )
+    if entry is None:
+        raise HTTPException(status_code=409, detail="Journal entry already exists for this day")
+    _poll_cache.pop("scopes")
     enqueue_ingest(entry)
-    return entry
+    return _json_response(_encode_entry(entry))
+
+
+JOURNAL_BATCH_MAX_ENTRIES = int(os.getenv("JOURNAL_BATCH_MAX_ENTRIES", "500"))
+_ENTRY_CREATE_BATCH = TypeAdapter(
+    Annotated[list[JournalEntryCreate], Field(max_length=JOURNAL_BATCH_MAX_ENTRIES)]
+)
+
+
+@app.post(
+    "/v1/journal/entries/batch",
+    response_model=list[JournalEntry],
+    openapi_extra=_request_body(_ENTRY_CREATE_BATCH),
+)
+async def create_entries(request: Request, session: AsyncSession = Depends(get_session)):
+    """Bulk import; returns the entries created, skipping days that already exist."""
+    items = await _validate_body(_ENTRY_CREATE_BATCH, request)
+    entries = await create_journal_entries(
+        session=session, entries=_ENTRY_CREATE_BATCH.dump_python(items)
+    )
+    if entries:
+        _poll_cache.pop("scopes")
+    for entry in entries:
+        enqueue_ingest(entry)
+    return _json_response([_encode_entry(entry) for entry in entries])
 
 
 @app.post("/v1/journal/entries/ensure", response_model=JournalEntry)
@@ -261,7 +407,7 @@ async def ensure_entry(
     request: JournalEntryEnsure,
     session: AsyncSession = Depends(get_session),
 ):
-    return await ensure_journal_entry(
+    entry, inserted, revived = await ensure_journal_entry(
         session=session,
         journal_date=request.journal_date,
         scope=request.scope,
@@ -269,45 +415,58 @@ async def ensure_entry(
         body=request.body,
         tags=request.tags,
     )
+    if revived:
+        enqueue_ingest(entry)
+        clear_context_cache({entry["scope"]})
+    if inserted or revived:
+        _poll_cache.pop("scopes")
+    return _json_response(_encode_entry(entry))
 
 
 @app.get("/v1/journal/entries", response_model=list[JournalEntry])
 async def list_entries(
-    scope: str = Query(..., pattern=SCOPE_PATTERN),
+    scope: ScopeQuery,
     limit: int = Query(50, ge=1, le=200),
     status: str = Query("active"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     if status not in ("active", "deleted", "all"):
         raise HTTPException(status_code=400, detail="Invalid status filter")
-    return await list_journal_entries(
+    entries = await list_journal_entries(
         session=session, scope=scope, limit=limit, status=status
     )
+    return _json_response([_encode_entry(row) for row in entries])
 
 
 @app.get("/v1/journal/scopes", response_model=list[str])
-async def list_scopes(session: AsyncSession = Depends(get_session)):
-    return await list_journal_scopes(session=session)
+async def list_scopes(
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await _cached_json(
+        "scopes", lambda: list_journal_scopes(session=session), if_none_match
+    )
 
 
 @app.get("/v1/journal/entries/dates", response_model=list[JournalEntryMarker])
 async def list_entry_markers(
     start: date = Query(...),
     end: date = Query(...),
-    scope: str | None = Query(default=None, pattern=SCOPE_PATTERN),
-    session: AsyncSession = Depends(get_session),
+    scope: OptionalScopeQuery = None,
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return await list_journal_entry_markers(
+    markers = await list_journal_entry_markers(
         session=session, start_date=start, end_date=end, scope=scope
     )
+    return _json_response([_encode_marker(row) for row in markers])
 
 
 @app.get("/v1/journal/entries/by-date", response_model=JournalEntry)
 async def get_entry_by_date(
-    scope: str = Query(..., pattern=SCOPE_PATTERN),
+    scope: ScopeQuery,
     date_str: str = Query(..., alias="date"),
     include_deleted: bool = Query(False),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     try:
         journal_date = dt_date.fromisoformat(date_str)
@@ -321,30 +480,44 @@ async def get_entry_by_date(
     )
     if entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
-    return entry
+    return _json_response(_encode_entry(entry))
+
+
+def _entry_etag(entry: dict[str, Any]) -> str:
+    # Entries have no updated_at, so the validator is a digest of the content.
+    digest = hashlib.blake2b(orjson.dumps(entry), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    return bool(if_none_match) and etag in (tag.strip() for tag in if_none_match.split(","))
 
 
 @app.get("/v1/journal/entries/{entry_id:uuid}", response_model=JournalEntry)
 async def get_entry(
     entry_id: UUID,
     include_deleted: bool = Query(False),
-    session: AsyncSession = Depends(get_session),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
 ):
     entry = await get_journal_entry(session, entry_id, include_deleted=include_deleted)
     if entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
-    return entry
+    etag = _entry_etag(entry)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return _json_response(_encode_entry(entry), headers={"ETag": etag})
 
 
 @app.get("/v1/journal/entries/{entry_id:uuid}/tasks", response_model=list[JournalTask])
-async def list_tasks(
-    entry_id: UUID,
-    session: AsyncSession = Depends(get_session),
-):
-    entry = await get_journal_entry(session, entry_id)
+async def list_tasks(entry_id: UUID):
+    entry, tasks = await gather_read(
+        lambda session: get_journal_entry(session, entry_id),
+        lambda session: list_journal_tasks(session=session, entry_id=entry_id),
+    )
     if entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
-    return await list_journal_tasks(session=session, entry_id=entry_id)
+    return _json_response([_encode_task(row) for row in tasks])
 
 
 @app.post("/v1/journal/entries/{entry_id:uuid}/tasks", response_model=JournalTask)
@@ -353,14 +526,12 @@ async def create_task(
     request: JournalTaskCreate,
     session: AsyncSession = Depends(get_session),
 ):
-    entry = await get_journal_entry(session, entry_id)
-    if entry is None:
-        raise HTTPException(status_code=404, detail="Journal entry not found")
-    tasks = await list_journal_tasks(session=session, entry_id=entry_id)
-    next_order = request.sort_order if request.sort_order is not None else len(tasks)
-    return await create_journal_task(
-        session=session, entry_id=entry_id, text=request.text, sort_order=next_order
+    task = await create_journal_task(
+        session=session, entry_id=entry_id, text=request.text, sort_order=request.sort_order
     )
+    if task is None:
+        raise HTTPException(status_code=404, detail="Journal entry not found")
+    return _json_response(_encode_task(task))
 
 
 @app.patch("/v1/journal/tasks/{task_id}", response_model=JournalTask)
@@ -374,11 +545,11 @@ async def update_task(
         task = await get_journal_task(session=session, task_id=task_id)
         if task is None:
             raise HTTPException(status_code=404, detail="Journal task not found")
-        return task
+        return _json_response(_encode_task(task))
     task = await update_journal_task(session=session, task_id=task_id, fields=fields)
     if task is None:
         raise HTTPException(status_code=404, detail="Journal task not found")
-    return task
+    return _json_response(_encode_task(task))
 
 
 @app.delete("/v1/journal/tasks/{task_id}", status_code=204)
@@ -397,25 +568,20 @@ async def update_entry(
     request: JournalEntryUpdate,
     session: AsyncSession = Depends(get_session),
 ):
-    fields: dict[str, object] = {}
-    if "title" in request.model_fields_set:
-        fields["title"] = request.title
-    if "body" in request.model_fields_set:
-        fields["body"] = request.body
-    if "tags" in request.model_fields_set:
-        fields["tags"] = request.tags
+    # Every JournalEntryUpdate field is updatable; getattr keeps the body as
+    # parsed rather than deep-copying it the way model_dump would.
+    fields = {name: getattr(request, name) for name in request.model_fields_set}
     if not fields:
         raise HTTPException(status_code=400, detail="No fields to update")
-    entry = await update_journal_entry(session=session, entry_id=entry_id, fields=fields)
+    entry, pruned = await update_journal_entry(session=session, entry_id=entry_id, fields=fields)
     if entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
-    title = (entry.get("title") or "").strip()
-    body_text = extract_journal_text(entry.get("body") or {})
-    if not title and not body_text:
-        await delete_journal_entry(session, entry_id)
+    if pruned:
+        clear_context_cache({entry["scope"]})
+        _poll_cache.pop("scopes")
         return Response(status_code=204)
     enqueue_ingest(entry)
-    return entry
+    return _json_response(_encode_entry(entry))
 
 
 @app.delete("/v1/journal/entries/{entry_id:uuid}", status_code=204)
@@ -423,9 +589,11 @@ async def delete_entry(
     entry_id: UUID,
     session: AsyncSession = Depends(get_session),
 ):
-    deleted = await delete_journal_entry(session, entry_id)
-    if not deleted:
+    scope = await delete_journal_entry(session, entry_id)
+    if scope is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
+    clear_context_cache({scope})
+    _poll_cache.pop("scopes")
 
 
 @app.post("/v1/journal/entries/{entry_id:uuid}/restore", response_model=JournalEntry)
@@ -436,7 +604,9 @@ async def restore_entry(
     entry = await restore_journal_entry(session, entry_id)
     if entry is None:
         raise HTTPException(status_code=404, detail="Journal entry not found")
-    return entry
+    clear_context_cache({entry["scope"]})
+    _poll_cache.pop("scopes")
+    return _json_response(_encode_entry(entry))
 
 
 @app.post("/v1/rag/reindex/journal", response_model=RagIngestJob)
@@ -446,14 +616,16 @@ async def reindex_journal(
 ):
     model = embedding_model or DEFAULT_EMBEDDING_MODEL
     job = await create_ingest_job(session=session, embedding_model=model)
-    asyncio.create_task(reindex_journal_entries(job["id"], model))
+    if not enqueue_reindex(job["id"], model):
+        await mark_job_failed(session, job["id"], "Reindex queue is full")
+        raise HTTPException(status_code=429, detail="Too many reindex jobs queued")
     return job
 
 
 @app.get("/v1/rag/jobs/{job_id}", response_model=RagIngestJob)
 async def get_rag_job(
     job_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     job = await get_ingest_job(session, job_id)
     if job is None:
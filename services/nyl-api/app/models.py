@@ -4,16 +4,52 @@ from datetime import date, datetime
 from typing import Any
 from uuid import UUID, uuid4
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Text, UniqueConstraint, func
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+import orjson
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    Date,
+    DateTime,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID as PG_UUID
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class HalfVec(HALFVEC):
+    """HALFVEC whose bind values are rendered by orjson.
+
+    pgvector's own processor formats each float in a Python loop (~450 us
+    for 768 dims); orjson writes the same ``[x,y,...]`` text in C (~25 us).
+    Postgres rounds the values to half precision on input either way.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        dim = self.dim
+
+        def process(value):
+            if value is None:
+                return None
+            if dim is not None and len(value) != dim:
+                raise ValueError(f"expected {dim} dimensions, not {len(value)}")
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+        return process
+
+
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
 
@@ -25,19 +61,62 @@ class JournalEntry(Base):
     scope: Mapped[str] = mapped_column(Text, nullable=False)
     title: Mapped[str | None] = mapped_column(Text)
     body: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    # blake2b of the canonical (sorted-key) body JSON; lets updates keep the
+    # stored body when it is unchanged. NULL for rows written before 0012.
+    body_hash: Mapped[bytes | None] = mapped_column(LargeBinary)
     tags: Mapped[list[str] | None] = mapped_column(ARRAY(Text))
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    embedding: Mapped[list[float] | None] = mapped_column(Vector(768))
+    # Stamped by the journal_entries_stamp_deleted_at trigger whenever is_deleted changes.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_onupdate=FetchedValue()
+    )
+    embedding: Mapped[list[float] | None] = mapped_column(HalfVec(768))
     embedding_model: Mapped[str | None] = mapped_column(Text)
     content_hash: Mapped[str | None] = mapped_column(Text)
+    # Full-text vector over every TipTap text node, maintained by Postgres.
+    # Deferred so entity loads never ship it; match with text_body.match(...).
+    text_body: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', jsonb_path_query_array(body, 'strict $.**.text')::text)",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Never loaded implicitly; callers that need tasks query them directly or
+    # opt in with selectinload().
+    tasks: Mapped[list[JournalTask]] = relationship(
+        back_populates="entry", lazy="raise_on_sql", passive_deletes=True
+    )
 
     __table_args__ = (
         Index(
-            "journal_entries_scope_date_idx",
+            "journal_entries_active_scope_date_idx",
             "scope",
             journal_date.desc(),
             created_at.desc(),
+            postgresql_where=is_deleted.is_(False),
+        ),
+        # Serves containment lookups only: filter with body.contains({...})
+        # (body @> :doc), not body["k"].astext == ..., to hit this index.
+        Index(
+            "journal_entries_body_gin_idx",
+            body,
+            postgresql_using="gin",
+            postgresql_ops={"body": "jsonb_path_ops"},
+        ),
+        Index("journal_entries_text_body_idx", text_body, postgresql_using="gin"),
+        # Denser graph than pgvector's defaults (m=16, ef_construction=64) for
+        # better recall at the small top_k the RAG path asks for. Live entries
+        # only; vector search must filter is_deleted to use it.
+        Index(
+            "journal_entries_active_embedding_hnsw_idx",
+            embedding,
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+            postgresql_with={"m": 24, "ef_construction": 128},
+            postgresql_where=is_deleted.is_(False),
         ),
         UniqueConstraint("scope", "journal_date", name="journal_entries_scope_date_key"),
     )
@@ -78,6 +157,8 @@ class JournalTask(Base):
     done: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     sort_order: Mapped[int] = mapped_column(nullable=False, default=0)
 
+    entry: Mapped[JournalEntry] = relationship(back_populates="tasks", lazy="raise_on_sql")
+
     __table_args__ = (
         Index("journal_tasks_entry_idx", "entry_id", "sort_order"),
     )
@@ -100,8 +181,30 @@ class ChatSession(Base):
     archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    messages: Mapped[list[ChatMessage]] = relationship(
+        back_populates="session", lazy="raise_on_sql", passive_deletes=True
+    )
+
     __table_args__ = (
-        Index("chat_sessions_updated_idx", "updated_at"),
+        # One index per list_sessions status; predicates match
+        # chat_status_filters so the planner can use them. Unscoped active
+        # listings read the scoped index and sort the (small) active set.
+        Index(
+            "chat_sessions_active_scope_updated_idx",
+            "scope",
+            updated_at.desc(),
+            postgresql_where=(deleted_at.is_(None) & archived_at.is_(None)),
+        ),
+        Index(
+            "chat_sessions_archived_updated_idx",
+            updated_at.desc(),
+            postgresql_where=(deleted_at.is_(None) & archived_at.is_not(None)),
+        ),
+        Index(
+            "chat_sessions_deleted_updated_idx",
+            updated_at.desc(),
+            postgresql_where=deleted_at.is_not(None),
+        ),
     )
 
 
@@ -120,6 +223,8 @@ class ChatMessage(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
+    session: Mapped[ChatSession] = relationship(back_populates="messages", lazy="raise_on_sql")
+
     __table_args__ = (
         Index("chat_messages_session_idx", "session_id", "created_at"),
     )
@@ -2,8 +2,11 @@ import asyncio
 import logging
 import os
 import time
+from collections.abc import Collection, Mapping, Sequence
+from itertools import islice
 from typing import Any
 
+from .cache import TTLCache
 from .database import SessionLocal
 from .db import search_journal_entries_by_vector
 from .journal_text import extract_journal_text
@@ -15,12 +18,47 @@ LOGGER = logging.getLogger(__name__)
 RAG_TOP_K_DEFAULT = 5
 RAG_TOP_K_MAX = 8
 RAG_TIMEOUT_SECONDS = float(os.getenv("RAG_RETRIEVAL_TIMEOUT", "1.5"))
+RAG_CONTEXT_CACHE_SIZE = int(os.getenv("RAG_CONTEXT_CACHE_SIZE", "1024"))
+RAG_CONTEXT_CACHE_TTL = float(os.getenv("RAG_CONTEXT_CACHE_TTL", "900"))
+RAG_LAST_USER_SCAN_LIMIT = int(os.getenv("RAG_LAST_USER_SCAN_LIMIT", "32"))
+# hnsw.ef_search per query is top_k times this, but never below pgvector's
+# default of 40; a wider beam leaves more in-scope candidates for scoped
+# searches before they fall back to an exact scan.
+HNSW_EF_SEARCH_MULTIPLIER = int(os.getenv("HNSW_EF_SEARCH_MULTIPLIER", "8"))
+# Server-side cap on the vector search, inside the overall retrieval budget,
+# so a slow search is stopped in Postgres and not just abandoned by us.
+RAG_SEARCH_TIMEOUT_MS = int(
+    os.getenv("RAG_SEARCH_TIMEOUT_MS", str(int(RAG_TIMEOUT_SECONDS * 800)))
+)
+
+# Context blocks keyed by (query, embedding model, scope, top_k), so a repeated
+# question skips both the embedding call and the vector search. Evicted
+# whenever embeddings are written or entries are deleted/restored, since those
+# are the only changes that alter what the search returns.
+_context_cache = TTLCache(maxsize=RAG_CONTEXT_CACHE_SIZE, ttl=RAG_CONTEXT_CACHE_TTL)
+# Excerpts keyed by body_hash, which every body write refreshes, so entries
+# that keep turning up in searches are walked and trimmed only once.
+_excerpt_cache = TTLCache(maxsize=4096, ttl=RAG_CONTEXT_CACHE_TTL)
+
+
+def clear_context_cache(scopes: Collection[str] | None = None) -> None:
+    """Drop cached context blocks; with ``scopes``, only the ones whose search
+    could have returned entries from those scopes."""
+    if scopes is None:
+        _context_cache.clear()
+        return
+    # Unscoped searches (scope None) span every scope.
+    _context_cache.discard_if(lambda key: key[2] is None or key[2] in scopes)
 
 
 def _last_user_message(messages: list[ChatMessage]) -> str:
-    for message in reversed(messages):
-        if message.role == "user" and message.content.strip():
-            return message.content.strip()
+    # The question is at or near the end; a user turn further back than the
+    # scan limit is too stale to retrieve context for.
+    for message in islice(reversed(messages), RAG_LAST_USER_SCAN_LIMIT):
+        if message.role == "user":
+            content = message.content.strip()
+            if content:
+                return content
     return ""
 
 
@@ -34,7 +72,13 @@ def _format_date(raw_date: Any) -> str:
 
 
 def _excerpt(text: str, max_chars: int = 280) -> str:
-    normalized = " ".join(text.split())
+    # Only the first max_chars normalized characters are used, and
+    # normalizing a prefix yields a prefix of the normalized whole, so a
+    # bounded slice is enough unless whitespace ate most of it.
+    head = text[: max_chars * 4]
+    normalized = " ".join(head.split())
+    if len(normalized) <= max_chars and len(head) < len(text):
+        normalized = " ".join(text.split())
     if len(normalized) <= max_chars:
         return normalized
     cutoff = normalized.rfind(" ", 0, max_chars)
@@ -43,7 +87,19 @@ def _excerpt(text: str, max_chars: int = 280) -> str:
     return f"{normalized[:cutoff].rstrip()}..."
 
 
-def _build_context_block(results: list[dict[str, Any]]) -> str:
+def _entry_excerpt(item: Mapping[str, Any]) -> str:
+    body_hash = item.get("body_hash")
+    if body_hash is not None:
+        excerpt = _excerpt_cache.get(body_hash)
+        if excerpt is not None:
+            return excerpt
+    excerpt = _excerpt(extract_journal_text(item.get("body") or {}))
+    if body_hash is not None:
+        _excerpt_cache.set(body_hash, excerpt)
+    return excerpt
+
+
+def _build_context_block(results: Sequence[Mapping[str, Any]]) -> str:
     if not results:
         return (
             "Context:\n"
@@ -61,8 +117,7 @@ def _build_context_block(results: list[dict[str, Any]]) -> str:
         title = item.get("title") or "Untitled"
         journal_date = _format_date(item.get("journal_date"))
         source_id = str(item.get("id") or "unknown-id")
-        body_text = extract_journal_text(item.get("body") or {})
-        excerpt = _excerpt(body_text)
+        excerpt = _entry_excerpt(item)
         lines.append(f"- {journal_date} · {title} (id: {source_id})")
         if excerpt:
             lines.append(f"  Excerpt: {excerpt}")
@@ -76,19 +131,15 @@ def _build_context_block(results: list[dict[str, Any]]) -> str:
 
 
 def _inject_context(messages: list[ChatMessage], context_block: str) -> list[ChatMessage]:
-    updated: list[ChatMessage] = []
-    injected = False
-    for message in messages:
-        if message.role == "system" and not injected:
-            content = message.content.strip()
-            combined = f"{content}\n\n{context_block}".strip() if content else context_block
-            updated.append(ChatMessage(role="system", content=combined))
-            injected = True
-        else:
-            updated.append(message)
-    if not injected:
-        updated.insert(0, ChatMessage(role="system", content=context_block))
-    return updated
+    # The context goes right before the latest user turn rather than into the
+    # leading system prompt: the system prompt and earlier turns then form the
+    # same prefix on every request, so Ollama reuses their cached KV state and
+    # only prefills the context and the new question.
+    context = ChatMessage(role="system", content=context_block)
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].role == "user":
+            return [*messages[:index], context, *messages[index:]]
+    return [*messages, context]
 
 
 def _resolve_rag_config(rag: RagConfig | None) -> tuple[bool, int, str | None, str | None]:
@@ -116,14 +167,34 @@ async def apply_rag_context(request: ChatRequest, default_embedding_model: str)
         LOGGER.info("RAG skipped: no user message")
         return request
 
+    model = embedding_model or default_embedding_model
+    cache_key = (" ".join(query.split()), model, scope, top_k)
+    context_block = _context_cache.get(cache_key)
+    if context_block is not None:
+        LOGGER.info("RAG context cache hit (top_k=%s)", top_k)
+        updated_messages = _inject_context(request.messages, context_block)
+        return request.model_copy(update={"messages": updated_messages})
+
+    ef_search = max(40, top_k * HNSW_EF_SEARCH_MULTIPLIER)
+
     async def _build_context() -> str:
         ollama_client = get_ollama_client()
-        model = embedding_model or default_embedding_model
-        embedding = await embed_text(query, model=model, client=ollama_client)
-
         async with SessionLocal() as session:
+            # Check out the connection while the query is being embedded, so
+            # pool waits overlap the Ollama call instead of following it.
+            async with asyncio.TaskGroup() as group:
+                embedding_task = group.create_task(
+                    embed_text(query, model=model, client=ollama_client)
+                )
+                group.create_task(session.connection())
+            embedding = embedding_task.result()
             results = await search_journal_entries_by_vector(
-                session, embedding, top_k, scope=scope
+                session,
+                embedding,
+                top_k,
+                scope=scope,
+                ef_search=ef_search,
+                statement_timeout_ms=RAG_SEARCH_TIMEOUT_MS,
             )
 
         return _build_context_block(results)
@@ -135,7 +206,13 @@ async def apply_rag_context(request: ChatRequest, default_embedding_model: str)
         LOGGER.exception("RAG retrieval failed, continuing without context")
         return request
     duration_ms = (time.perf_counter() - start) * 1000
-    LOGGER.info("RAG context injected (top_k=%s, time_ms=%.1f)", top_k, duration_ms)
+    LOGGER.info(
+        "RAG context injected (top_k=%s, ef_search=%s, time_ms=%.1f)",
+        top_k,
+        ef_search,
+        duration_ms,
+    )
+    _context_cache.set(cache_key, context_block)
 
     updated_messages = _inject_context(request.messages, context_block)
     return request.model_copy(update={"messages": updated_messages})
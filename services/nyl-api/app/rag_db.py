@@ -4,26 +4,27 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 
 from .models import RagIngestJob
+from .repositories.base import row_to_dict
 
 
-def _job_to_dict(job: RagIngestJob) -> dict[str, Any]:
-    return {
-        "id": job.id,
-        "created_at": job.created_at,
-        "started_at": job.started_at,
-        "finished_at": job.finished_at,
-        "status": job.status,
-        "source_type": job.source_type,
-        "embedding_model": job.embedding_model,
-        "total": job.total,
-        "processed": job.processed,
-        "error_message": job.error_message,
-    }
+_JOB_COLUMNS = (
+    RagIngestJob.id,
+    RagIngestJob.created_at,
+    RagIngestJob.started_at,
+    RagIngestJob.finished_at,
+    RagIngestJob.status,
+    RagIngestJob.source_type,
+    RagIngestJob.embedding_model,
+    RagIngestJob.total,
+    RagIngestJob.processed,
+    RagIngestJob.error_message,
+)
+_job_to_dict = row_to_dict(_JOB_COLUMNS)
 
 
 async def create_ingest_job(
@@ -33,17 +34,20 @@ async def create_ingest_job(
     source_type: str = "journal",
     total: int = 0,
 ) -> dict[str, Any]:
-    job = RagIngestJob(
-        id=uuid4(),
-        status="pending",
-        source_type=source_type,
-        embedding_model=embedding_model,
-        total=total,
-        processed=0,
+    result = await session.execute(
+        insert(RagIngestJob)
+        .values(
+            id=uuid4(),
+            status="pending",
+            source_type=source_type,
+            embedding_model=embedding_model,
+            total=total,
+            processed=0,
+        )
+        .returning(RagIngestJob)
     )
-    session.add(job)
+    job = result.scalar_one()
     await session.commit()
-    await session.refresh(job)
     return _job_to_dict(job)
 
 
@@ -55,35 +59,26 @@ async def get_ingest_job(session: AsyncSession, job_id: UUID) -> dict[str, Any]
     return _job_to_dict(job) if job else None
 
 
-async def mark_job_running(session: AsyncSession, job_id: UUID) -> None:
+async def mark_job_running(session: AsyncSession, job_id: UUID, total: int) -> None:
     await session.execute(
         update(RagIngestJob)
         .where(RagIngestJob.id == job_id)
-        .values(status="running", started_at=func.now())
+        .values(status="running", started_at=func.now(), total=total)
     )
     await session.commit()
 
 
 async def update_job_progress(
-    session: AsyncSession, job_id: UUID, processed: int
+    session: AsyncSession, job_id: UUID, processed: int, *, commit: bool = True
 ) -> None:
+    """Record progress; with ``commit=False`` it rides on the caller's next commit."""
     await session.execute(
         update(RagIngestJob)
         .where(RagIngestJob.id == job_id)
         .values(processed=processed)
     )
-    await session.commit()
-
-
-async def update_job_total(
-    session: AsyncSession, job_id: UUID, total: int
-) -> None:
-    await session.execute(
-        update(RagIngestJob)
-        .where(RagIngestJob.id == job_id)
-        .values(total=total)
-    )
-    await session.commit()
+    if commit:
+        await session.commit()
 
 
 async def mark_job_completed(session: AsyncSession, job_id: UUID) -> None:
@@ -2,27 +2,79 @@ import asyncio
 import hashlib
 import logging
 import os
+from collections.abc import Mapping
 from typing import Any
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import func, select
 
-from .database import SessionLocal
-from .db import (
-    clear_journal_entry_embedding,
-    get_journal_entry_embedding_info,
-    update_journal_entry_embedding,
-)
+from .cache import TTLCache
+from .database import ReadSessionLocal, SessionLocal
+from .db import list_journal_entry_embedding_info, update_journal_entry_embeddings
 from .journal_text import extract_journal_text
 from .models import JournalEntry
-from .ollama import embed_text, get_ollama_client
-from .rag_db import mark_job_completed, mark_job_failed, mark_job_running, update_job_progress, update_job_total
+from .ollama import embed_texts, get_ollama_client
+from .rag_chat import clear_context_cache
+from .rag_db import mark_job_completed, mark_job_failed, mark_job_running, update_job_progress
 
 LOGGER = logging.getLogger(__name__)
 
 RAG_INGEST_ON_SAVE = os.getenv("RAG_INGEST_ON_SAVE", "true").lower() == "true"
 DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text:latest")
 EMBEDDING_CHUNK_SIZE = int(os.getenv("EMBEDDING_CHUNK_SIZE", "1500"))
+# Per-model overrides, e.g. "nomic-embed-text:latest=6000,mxbai-embed-large=1500",
+# so models with a larger context need fewer chunks per entry.
+EMBEDDING_CHUNK_SIZES = {
+    model.strip(): int(size)
+    for model, _, size in (
+        item.partition("=") for item in os.getenv("EMBEDDING_CHUNK_SIZES", "").split(",")
+    )
+    if model.strip() and size.strip()
+}
+REINDEX_PAGE_SIZE = int(os.getenv("REINDEX_PAGE_SIZE", "50"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "32"))
+INGEST_BATCH_WAIT = float(os.getenv("INGEST_BATCH_WAIT", "0.1"))
+REINDEX_QUEUE_SIZE = int(os.getenv("REINDEX_QUEUE_SIZE", "4"))
+# Texts per /api/embed call; chunks from several entries share a call.
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+# Content hashes are only change-detection fingerprints; any hashlib name
+# works. Changing it re-embeds each entry on its next save, or run a reindex.
+CONTENT_HASH_ALGO = os.getenv("CONTENT_HASH_ALGO", "sha256")
+
+
+def _check_content_hash_algo(name: str) -> None:
+    # Fail at startup rather than on every ingest; shake_* digests need a
+    # length for hexdigest() and are rejected too.
+    try:
+        digest_size = hashlib.new(name).digest_size
+    except ValueError as exc:
+        raise RuntimeError(f"Unsupported CONTENT_HASH_ALGO: {name!r}") from exc
+    if not digest_size:
+        raise RuntimeError(f"CONTENT_HASH_ALGO must have a fixed digest size: {name!r}")
+
+
+_check_content_hash_algo(CONTENT_HASH_ALGO)
+EMBEDDING_STATE_CACHE_SIZE = int(os.getenv("EMBEDDING_STATE_CACHE_SIZE", "10000"))
+EMBEDDING_STATE_CACHE_TTL = float(os.getenv("EMBEDDING_STATE_CACHE_TTL", "3600"))
+
+# Last known content_hash/embedding_model per entry id, as written or read by
+# this process, so an unchanged autosave is skipped without a database read.
+_embedding_state = TTLCache(maxsize=EMBEDDING_STATE_CACHE_SIZE, ttl=EMBEDDING_STATE_CACHE_TTL)
+CHUNK_EMBEDDING_CACHE_SIZE = int(os.getenv("CHUNK_EMBEDDING_CACHE_SIZE", "2048"))
+CHUNK_EMBEDDING_CACHE_TTL = float(os.getenv("CHUNK_EMBEDDING_CACHE_TTL", "3600"))
+# Chunk vectors keyed by (model, digest of the chunk text), so boilerplate
+# shared across entries (templates, daily headers) is embedded once. Values
+# are float32 arrays, about 3 KB each at 768 dimensions.
+_chunk_embeddings = TTLCache(maxsize=CHUNK_EMBEDDING_CACHE_SIZE, ttl=CHUNK_EMBEDDING_CACHE_TTL)
+
+_ingest_queue: asyncio.Queue[tuple[dict[str, Any], str | None]] = asyncio.Queue(
+    maxsize=INGEST_QUEUE_SIZE
+)
+# Reindex jobs run one at a time on their own worker.
+_reindex_queue: asyncio.Queue[tuple[UUID, str]] = asyncio.Queue(maxsize=REINDEX_QUEUE_SIZE)
+_workers: list[asyncio.Task[None]] = []
 
 
 def build_content_hash(title: str | None, body_text: str, tags: list[str] | None) -> str:
@@ -33,7 +85,10 @@ def build_content_hash(title: str | None, body_text: str, tags: list[str] | None
             ",".join(tags or []),
         ]
     )
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    data = payload.encode("utf-8")
+    if CONTENT_HASH_ALGO == "blake2b":
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+    return hashlib.new(CONTENT_HASH_ALGO, data).hexdigest()
 
 
 def _chunk_text(text: str, max_size: int) -> list[str]:
@@ -65,120 +120,279 @@ def _chunk_text(text: str, max_size: int) -> list[str]:
     return chunks
 
 
-def _average_vectors(vectors: list[list[float]]) -> list[float]:
+def _average_vectors(vectors: list[list[float]], weights: list[int]) -> list[float]:
+    """Mean of the chunk vectors weighted by chunk length, so a short tail
+    chunk does not count as much as a full one."""
     if not vectors:
         return []
-    length = len(vectors[0])
-    totals = [0.0] * length
-    for vector in vectors:
-        for idx in range(length):
-            totals[idx] += vector[idx]
-    return [value / len(vectors) for value in totals]
-
-
-async def ingest_journal_entry(
-    entry: dict[str, Any], embedding_model: str | None = None
-) -> None:
-    model = embedding_model or DEFAULT_EMBEDDING_MODEL
+    if len(vectors) == 1:
+        # Most entries fit in one chunk; their embedding is used as is.
+        return vectors[0]
+    # float32 is plenty for a column stored as halfvec.
+    return np.average(np.asarray(vectors, dtype=np.float32), axis=0, weights=weights).tolist()
+
+
+def _plan_embedding(
+    entry: Mapping[str, Any],
+    model: str,
+    existing: Mapping[str, Any] | None,
+) -> tuple[dict[str, Any], list[str]] | None:
+    """Return the row to write for ``entry`` and the chunks it still needs
+    embedded, or None if nothing changed. A row without chunks clears the
+    entry's embedding."""
     title = entry.get("title") or ""
     body_text = extract_journal_text(entry.get("body") or {})
     tags = entry.get("tags") or []
     content_hash = build_content_hash(title, body_text, tags)
     entry_id = entry.get("id")
+    chunks = _chunk_text(
+        f"{title}\n\n{body_text}".strip(), EMBEDDING_CHUNK_SIZES.get(model, EMBEDDING_CHUNK_SIZE)
+    )
+
+    if not chunks:
+        # Clear embedding if content is empty
+        if existing and existing.get("content_hash"):
+            return {
+                "id": entry_id,
+                "embedding": None,
+                "embedding_model": None,
+                "content_hash": None,
+            }, []
+        return None
+
+    # Skip if unchanged
+    if existing:
+        if (
+            existing.get("content_hash") == content_hash
+            and existing.get("embedding_model") == model
+        ):
+            return None
+
+    return {
+        "id": entry_id,
+        "embedding": None,
+        "embedding_model": model,
+        "content_hash": content_hash,
+    }, chunks
 
-    async with SessionLocal() as session:
-        # Check if we need to update
-        existing = await get_journal_entry_embedding_info(session, entry_id)
-
-        if not title and not body_text:
-            # Clear embedding if content is empty
-            if existing and existing.get("content_hash"):
-                await clear_journal_entry_embedding(session, entry_id)
-            return
-
-        # Skip if unchanged
-        if existing:
-            if (
-                existing.get("content_hash") == content_hash
-                and existing.get("embedding_model") == model
-            ):
-                return
-
-        # Generate embedding
-        ollama_client = get_ollama_client()
-        full_text = f"{title}\n\n{body_text}".strip()
-        chunks = _chunk_text(full_text, EMBEDDING_CHUNK_SIZE)
-        embeddings: list[list[float]] = []
-        for chunk in chunks:
-            embeddings.append(await embed_text(chunk, model=model, client=ollama_client))
-        embedding = _average_vectors(embeddings)
 
+async def _build_embedding_rows(
+    plans: list[tuple[dict[str, Any], list[str]]], model: str
+) -> list[dict[str, Any]]:
+    """Embed the chunks of every plan, EMBED_BATCH_SIZE texts per Ollama call,
+    and fill in each row's averaged embedding."""
+    texts = [chunk for _, chunks in plans for chunk in chunks]
+    keys = [
+        (model, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()) for text in texts
+    ]
+    found: dict[tuple[str, bytes], list[float]] = {}
+    missing: dict[tuple[str, bytes], str] = {}
+    for key, text in zip(keys, texts):
+        cached = _chunk_embeddings.get(key)
+        if cached is not None:
+            found[key] = cached.tolist()
+        else:
+            missing.setdefault(key, text)
+    if missing:
+        ollama_client = get_ollama_client()
+        missing_keys = list(missing)
+        missing_texts = list(missing.values())
+        for start in range(0, len(missing_texts), EMBED_BATCH_SIZE):
+            batch = await embed_texts(
+                missing_texts[start : start + EMBED_BATCH_SIZE], model=model, client=ollama_client
+            )
+            for key, vector in zip(missing_keys[start : start + EMBED_BATCH_SIZE], batch):
+                found[key] = vector
+                _chunk_embeddings.set(key, np.asarray(vector, dtype=np.float32))
+    vectors = [found[key] for key in keys]
+    rows: list[dict[str, Any]] = []
+    offset = 0
+    for row, chunks in plans:
+        if chunks:
+            row["embedding"] = _average_vectors(
+                vectors[offset : offset + len(chunks)], [len(chunk) for chunk in chunks]
+            )
+            offset += len(chunks)
+        rows.append(row)
+    if texts:
         LOGGER.info(
-            "PostgreSQL embedding length=%s model=%s chunks=%s",
-            len(embedding),
+            "PostgreSQL embeddings entries=%s chunks=%s embedded=%s model=%s",
+            len(plans),
+            len(texts),
+            len(missing),
             model,
-            len(chunks),
         )
+    return rows
 
-        # Store in PostgreSQL
-        await update_journal_entry_embedding(
-            session, entry_id, embedding, model, content_hash
-        )
 
+def _remember_embedding_state(row: Mapping[str, Any]) -> None:
+    _embedding_state.set(
+        row["id"],
+        {"content_hash": row["content_hash"], "embedding_model": row["embedding_model"]},
+    )
 
-def enqueue_ingest(entry: dict[str, Any], embedding_model: str | None = None) -> None:
-    if not RAG_INGEST_ON_SAVE:
-        return
 
-    async def _runner() -> None:
+async def ingest_journal_entries(batch: list[tuple[dict[str, Any], str | None]]) -> None:
+    """Embed a batch of saved entries and write the changed ones in one UPDATE."""
+    # Later saves of the same entry supersede earlier ones.
+    latest = {entry.get("id"): (entry, model) for entry, model in batch}
+    existing: dict[Any, Mapping[str, Any]] = {}
+    misses = []
+    for entry_id in latest:
+        state = _embedding_state.get(entry_id)
+        if state is None:
+            misses.append(entry_id)
+        else:
+            existing[entry_id] = state
+    if misses:
+        async with ReadSessionLocal() as session:
+            fetched = await list_journal_entry_embedding_info(session, misses)
+        for entry_id, row in fetched.items():
+            _remember_embedding_state(row)
+            existing[entry_id] = row
+    plans: dict[str, list[tuple[dict[str, Any], list[str]]]] = {}
+    for entry_id, (entry, model) in latest.items():
+        model = model or DEFAULT_EMBEDDING_MODEL
+        try:
+            plan = _plan_embedding(entry, model, existing.get(entry_id))
+        except Exception:
+            LOGGER.exception("Journal ingestion failed for entry %s", entry_id)
+            continue
+        if plan is not None:
+            plans.setdefault(model, []).append(plan)
+    rows: list[dict[str, Any]] = []
+    for model, model_plans in plans.items():
+        try:
+            rows.extend(await _build_embedding_rows(model_plans, model))
+        except Exception:
+            LOGGER.exception(
+                "Journal ingestion failed for %s entries (model=%s)", len(model_plans), model
+            )
+    if rows:
+        async with SessionLocal() as session:
+            await update_journal_entry_embeddings(session, rows)
+        for row in rows:
+            _remember_embedding_state(row)
+        clear_context_cache({latest[row["id"]][0].get("scope") for row in rows})
+
+
+async def _run_ingest_worker() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _ingest_queue.get()]
+        deadline = loop.time() + INGEST_BATCH_WAIT
+        while len(batch) < INGEST_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_ingest_queue.get(), timeout))
+            except TimeoutError:
+                break
+        try:
+            await ingest_journal_entries(batch)
+        except Exception:
+            LOGGER.exception("Journal ingestion batch failed")
+
+
+async def _run_reindex_worker() -> None:
+    while True:
+        job_id, embedding_model = await _reindex_queue.get()
         try:
-            await ingest_journal_entry(entry, embedding_model=embedding_model)
+            await reindex_journal_entries(job_id, embedding_model)
         except Exception:
-            LOGGER.exception("Journal ingestion failed")
+            # e.g. mark_job_failed itself failing; keep serving later jobs.
+            LOGGER.exception("RAG reindex job %s failed", job_id)
 
-    asyncio.create_task(_runner())
+
+def start_ingest_workers() -> None:
+    if not _workers:
+        _workers.append(asyncio.create_task(_run_ingest_worker()))
+        _workers.append(asyncio.create_task(_run_reindex_worker()))
+
+
+async def stop_ingest_workers() -> None:
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    if not _ingest_queue.empty():
+        LOGGER.warning("Dropping %s queued journal ingestions", _ingest_queue.qsize())
+    if not _reindex_queue.empty():
+        LOGGER.warning("Dropping %s queued reindex jobs", _reindex_queue.qsize())
+
+
+def enqueue_ingest(entry: dict[str, Any], embedding_model: str | None = None) -> None:
+    if not RAG_INGEST_ON_SAVE:
+        return
+    try:
+        _ingest_queue.put_nowait((entry, embedding_model))
+    except asyncio.QueueFull:
+        LOGGER.warning("Ingest queue full; dropping journal entry %s", entry.get("id"))
 
 
 async def reindex_journal_entries(job_id: UUID, embedding_model: str) -> None:
     async with SessionLocal() as session:
         try:
-            await mark_job_running(session, job_id)
-
             count_result = await session.execute(
                 select(func.count()).select_from(JournalEntry)
             )
             total = count_result.scalar_one() or 0
-            await update_job_total(session, job_id, total)
+            await mark_job_running(session, job_id, total)
 
             processed = 0
-            page_size = 50
+            last_id = None
             while processed < total:
-                entries_result = await session.execute(
-                    select(JournalEntry)
-                    .order_by(JournalEntry.created_at.asc())
-                    .offset(processed)
-                    .limit(page_size)
+                # The page already carries the current hash/model, so there is
+                # no per-entry lookup, and the page's writes go out as one batch.
+                # It is read in autocommit so no transaction stays open while
+                # the entries are embedded. Pages are keyed on the primary key
+                # rather than OFFSET, so each one is a short index range scan.
+                page = (
+                    select(
+                        JournalEntry.id,
+                        JournalEntry.title,
+                        JournalEntry.body,
+                        JournalEntry.tags,
+                        JournalEntry.content_hash,
+                        JournalEntry.embedding_model,
+                    )
+                    .order_by(JournalEntry.id)
+                    .limit(REINDEX_PAGE_SIZE)
                 )
-                entries = entries_result.scalars().all()
+                if last_id is not None:
+                    page = page.where(JournalEntry.id > last_id)
+                async with ReadSessionLocal() as read_session:
+                    entries_result = await read_session.execute(page)
+                    entries = entries_result.mappings().all()
                 if not entries:
                     break
-                for entry in entries:
-                    await ingest_journal_entry(
-                        {
-                            "id": entry.id,
-                            "created_at": entry.created_at,
-                            "journal_date": entry.journal_date,
-                            "scope": entry.scope,
-                            "title": entry.title,
-                            "body": entry.body,
-                            "tags": entry.tags,
-                        },
-                        embedding_model=embedding_model,
-                    )
-                    processed += 1
-                await update_job_progress(session, job_id, processed)
+                last_id = entries[-1]["id"]
+                plans = [
+                    plan
+                    for entry in entries
+                    if (plan := _plan_embedding(entry, embedding_model, entry)) is not None
+                ]
+                rows = await _build_embedding_rows(plans, embedding_model)
+                processed += len(entries)
+                # Progress and the page's embeddings go out in one commit.
+                await update_job_progress(session, job_id, processed, commit=not rows)
+                await update_journal_entry_embeddings(session, rows)
+                for row in (*entries, *rows):
+                    _remember_embedding_state(row)
+                if rows:
+                    clear_context_cache()
 
             await mark_job_completed(session, job_id)
         except Exception as exc:
             await mark_job_failed(session, job_id, str(exc))
             LOGGER.exception("RAG reindex failed")
+
+
+def enqueue_reindex(job_id: UUID, embedding_model: str) -> bool:
+    """Queue a reindex job; False if the queue is full."""
+    try:
+        _reindex_queue.put_nowait((job_id, embedding_model))
+    except asyncio.QueueFull:
+        return False
+    return True
@@ -1,4 +1,4 @@
-from .base import ChatStatus, chat_status_filters
+from .base import ChatStatus, chat_status_filters, row_to_dict
 from .chat import ChatRepository
 
-__all__ = ["ChatRepository", "ChatStatus", "chat_status_filters"]
+__all__ = ["ChatRepository", "ChatStatus", "chat_status_filters", "row_to_dict"]
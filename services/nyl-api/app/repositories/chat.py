@@ -1,38 +1,119 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import os
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import RowMapping, Text, bindparam, case, delete, func, insert, lambda_stmt, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..cache import TTLCache
 from ..models import ChatMessage, ChatSession
-from .base import ChatStatus, chat_status_filters
+from .base import ChatStatus, chat_status_filters, row_to_dict
 
+SESSION_CACHE_SIZE = int(os.getenv("CHAT_SESSION_CACHE_SIZE", "1024"))
+SESSION_CACHE_TTL = float(os.getenv("CHAT_SESSION_CACHE_TTL", "30"))
 
-def _session_to_dict(session: ChatSession) -> dict[str, Any]:
-    return {
-        "id": session.id,
-        "title": session.title,
-        "model": session.model,
-        "system_prompt": session.system_prompt,
-        "scope": session.scope,
-        "created_at": session.created_at,
-        "updated_at": session.updated_at,
-        "archived_at": session.archived_at,
-        "deleted_at": session.deleted_at,
-    }
+# Keyed by chat session id; refreshed or evicted by every write in ChatRepository.
+_session_cache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
 
 
-def _message_to_dict(message: ChatMessage) -> dict[str, Any]:
-    return {
-        "id": message.id,
-        "session_id": message.session_id,
-        "role": message.role,
-        "content": message.content,
-        "created_at": message.created_at,
-    }
+_SESSION_COLUMNS = (
+    ChatSession.id,
+    ChatSession.title,
+    ChatSession.model,
+    ChatSession.system_prompt,
+    ChatSession.scope,
+    ChatSession.created_at,
+    ChatSession.updated_at,
+    ChatSession.archived_at,
+    ChatSession.deleted_at,
+)
+_session_to_dict = row_to_dict(_SESSION_COLUMNS)
+
+
+_MESSAGE_COLUMNS = (
+    ChatMessage.id,
+    ChatMessage.session_id,
+    ChatMessage.role,
+    ChatMessage.content,
+    ChatMessage.created_at,
+)
+# Message columns for the session + messages join, labelled apart from the
+# session's own id and created_at.
+_JOINED_MESSAGE_COLUMNS = tuple(column.label(f"m_{column.key}") for column in _MESSAGE_COLUMNS)
+_MESSAGE_KEYS = tuple(column.key for column in _MESSAGE_COLUMNS)
+
+
+@lru_cache(maxsize=8)
+def _add_messages_statement(columns: frozenset[str]):
+    """Build the touch-session-and-insert-messages statement for one set of
+    session columns being changed.
+
+    The session UPDATE runs as a CTE and the messages are inserted from
+    unnest() over array parameters joined to it, so the whole turn is one
+    round trip and nothing is inserted for a missing or deleted session.
+    """
+    values: dict[str, Any] = {"updated_at": func.now()}
+    for name in ("model", "system_prompt"):
+        if name in columns:
+            values[name] = bindparam(f"b_{name}", type_=Text)
+    if "title" in columns:
+        # Only a session still on the default title takes the new one.
+        values["title"] = case(
+            (func.lower(func.trim(ChatSession.title)) == "new chat", bindparam("b_title", type_=Text)),
+            else_=ChatSession.title,
+        )
+    touched = (
+        update(ChatSession)
+        .where(ChatSession.id == bindparam("b_session_id"), ChatSession.deleted_at.is_(None))
+        .values(values)
+        .returning(ChatSession.id)
+        .cte("touched")
+    )
+    rows = func.unnest(
+        bindparam("b_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+        bindparam("b_roles", type_=ARRAY(Text)),
+        bindparam("b_contents", type_=ARRAY(Text)),
+    ).table_valued("id", "role", "content", with_ordinality="ord").render_derived()
+    return (
+        insert(ChatMessage)
+        .from_select(
+            ["id", "session_id", "role", "content"],
+            select(rows.c.id, touched.c.id, rows.c.role, rows.c.content).order_by(rows.c.ord),
+        )
+        .add_cte(touched)
+        .returning(*_MESSAGE_COLUMNS)
+    )
+
+
+def _cache_session(session_id: UUID, chat_session: Any) -> dict[str, Any] | None:
+    if chat_session is None:
+        _session_cache.pop(session_id)
+        return None
+    data = _session_to_dict(chat_session)
+    _session_cache.set(session_id, dict(data))
+    return data
+
+
+async def _update_session(
+    session: AsyncSession, session_id: UUID, **values: Any
+) -> dict[str, Any] | None:
+    """UPDATE one chat session, returning and caching the new row in the same round trip."""
+    result = await session.execute(
+        update(ChatSession)
+        .where(ChatSession.id == session_id)
+        .values(**values)
+        .returning(*_SESSION_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    await session.commit()
+    return _cache_session(session_id, row)
 
 
 class ChatRepository:
@@ -52,17 +133,21 @@ class ChatRepository:
         scope: str | None,
     ) -> dict[str, Any]:
         """Create a new chat session."""
-        chat_session = ChatSession(
-            id=uuid4(),
-            title=(title or "New chat").strip() or "New chat",
-            model=model,
-            system_prompt=system_prompt,
-            scope=scope,
+        result = await session.execute(
+            insert(ChatSession)
+            .values(
+                id=uuid4(),
+                title=(title or "New chat").strip() or "New chat",
+                model=model,
+                system_prompt=system_prompt,
+                scope=scope,
+            )
+            .returning(*_SESSION_COLUMNS)
         )
-        session.add(chat_session)
+        chat_session = dict(result.mappings().one())
         await session.commit()
-        await session.refresh(chat_session)
-        return _session_to_dict(chat_session)
+        _session_cache.set(chat_session["id"], dict(chat_session))
+        return chat_session
 
     async def get_session(
         self,
@@ -71,12 +156,21 @@ class ChatRepository:
         include_deleted: bool = False,
     ) -> dict[str, Any] | None:
         """Get a chat session by ID."""
-        filters = [ChatSession.id == session_id]
+        cached = _session_cache.get(session_id)
+        if cached is not None:
+            if cached["deleted_at"] is not None and not include_deleted:
+                return None
+            return dict(cached)
+        stmt = lambda_stmt(lambda: select(ChatSession).where(ChatSession.id == session_id))
         if not include_deleted:
-            filters.append(ChatSession.deleted_at.is_(None))
-        result = await session.execute(select(ChatSession).where(*filters))
+            stmt += lambda s: s.where(ChatSession.deleted_at.is_(None))
+        result = await session.execute(stmt)
         chat_session = result.scalar_one_or_none()
-        return _session_to_dict(chat_session) if chat_session else None
+        if chat_session is None:
+            return None
+        data = _session_to_dict(chat_session)
+        _session_cache.set(session_id, data)
+        return dict(data)
 
     async def list_sessions(
         self,
@@ -85,7 +179,7 @@ class ChatRepository:
         status: ChatStatus | str = ChatStatus.ACTIVE,
         scope: str | None = None,
         limit: int = 100,
-    ) -> list[dict[str, Any]]:
+    ) -> Sequence[RowMapping]:
         """List chat sessions with status and optional scope filtering.
 
         If scope is None: no scope filter (returns all)
@@ -101,12 +195,12 @@ class ChatRepository:
             else:
                 filters.append(ChatSession.scope == scope)
         result = await session.execute(
-            select(ChatSession)
+            select(*_SESSION_COLUMNS)
             .where(*filters)
             .order_by(ChatSession.updated_at.desc())
             .limit(limit)
         )
-        return [_session_to_dict(item) for item in result.scalars().all()]
+        return result.mappings().all()
 
     async def update_session_title(
         self,
@@ -115,15 +209,7 @@ class ChatRepository:
         title: str,
     ) -> bool:
         """Update session title."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return False
-        chat_session.title = title
-        await session.commit()
-        return True
+        return await _update_session(session, session_id, title=title) is not None
 
     async def archive_session(
         self,
@@ -131,16 +217,7 @@ class ChatRepository:
         session_id: UUID,
     ) -> dict[str, Any] | None:
         """Archive a chat session."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return None
-        chat_session.archived_at = func.now()
-        await session.commit()
-        await session.refresh(chat_session)
-        return _session_to_dict(chat_session)
+        return await _update_session(session, session_id, archived_at=func.now())
 
     async def unarchive_session(
         self,
@@ -148,16 +225,7 @@ class ChatRepository:
         session_id: UUID,
     ) -> dict[str, Any] | None:
         """Unarchive a chat session."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return None
-        chat_session.archived_at = None
-        await session.commit()
-        await session.refresh(chat_session)
-        return _session_to_dict(chat_session)
+        return await _update_session(session, session_id, archived_at=None)
 
     async def soft_delete_session(
         self,
@@ -165,16 +233,7 @@ class ChatRepository:
         session_id: UUID,
     ) -> dict[str, Any] | None:
         """Soft delete a chat session."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return None
-        chat_session.deleted_at = func.now()
-        await session.commit()
-        await session.refresh(chat_session)
-        return _session_to_dict(chat_session)
+        return await _update_session(session, session_id, deleted_at=func.now())
 
     async def restore_session(
         self,
@@ -182,16 +241,7 @@ class ChatRepository:
         session_id: UUID,
     ) -> dict[str, Any] | None:
         """Restore a soft-deleted chat session."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return None
-        chat_session.deleted_at = None
-        await session.commit()
-        await session.refresh(chat_session)
-        return _session_to_dict(chat_session)
+        return await _update_session(session, session_id, deleted_at=None)
 
     async def purge_deleted_sessions(
         self,
@@ -199,70 +249,112 @@ class ChatRepository:
         *,
         older_than_days: int = 30,
     ) -> None:
-        """Permanently delete sessions that have been soft-deleted for a while."""
-        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
-        await session.execute(
-            delete(ChatMessage).where(
-                ChatMessage.session_id.in_(
-                    select(ChatSession.id).where(ChatSession.deleted_at < cutoff)
-                )
-            )
-        )
-        await session.execute(
+        """Permanently delete sessions that have been soft-deleted for a while.
+
+        Messages are removed by the ON DELETE CASCADE on chat_messages.session_id.
+        The deleted_at predicate implies the partial deleted-sessions index, so
+        this only reads soft-deleted rows.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        result = await session.execute(
             delete(ChatSession).where(ChatSession.deleted_at < cutoff)
         )
         await session.commit()
+        if result.rowcount:
+            _session_cache.clear()
 
     # -------------------------------------------------------------------------
     # Message CRUD
     # -------------------------------------------------------------------------
 
+    async def get_session_with_messages(
+        self,
+        session: AsyncSession,
+        session_id: UUID,
+        include_deleted: bool = False,
+    ) -> dict[str, Any] | None:
+        """Get a chat session and its messages.
+
+        A cached session only needs the messages query; otherwise both come
+        from one LEFT JOIN, so a page load is a single round trip either way.
+        """
+        cached = _session_cache.get(session_id)
+        if cached is not None:
+            if cached["deleted_at"] is not None and not include_deleted:
+                return None
+            return {
+                "session": dict(cached),
+                "messages": await self.list_messages(session, session_id),
+            }
+        stmt = lambda_stmt(
+            lambda: select(*_SESSION_COLUMNS, *_JOINED_MESSAGE_COLUMNS)
+            .outerjoin(ChatMessage, ChatMessage.session_id == ChatSession.id)
+            .where(ChatSession.id == session_id)
+            .order_by(ChatMessage.created_at.asc())
+        )
+        if not include_deleted:
+            stmt += lambda s: s.where(ChatSession.deleted_at.is_(None))
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return None
+        chat_session = _session_to_dict(rows[0])
+        _session_cache.set(session_id, dict(chat_session))
+        messages = [
+            dict(zip(_MESSAGE_KEYS, row[len(_SESSION_COLUMNS) :]))
+            for row in rows
+            if row.m_id is not None
+        ]
+        return {"session": chat_session, "messages": messages}
+
     async def list_messages(
         self,
         session: AsyncSession,
         session_id: UUID,
-    ) -> list[dict[str, Any]]:
+    ) -> Sequence[RowMapping]:
         """List all messages in a chat session."""
         result = await session.execute(
-            select(ChatMessage)
-            .where(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at.asc())
+            lambda_stmt(
+                lambda: select(*_MESSAGE_COLUMNS)
+                .where(ChatMessage.session_id == session_id)
+                .order_by(ChatMessage.created_at.asc())
+            )
         )
-        return [_message_to_dict(message) for message in result.scalars().all()]
+        return result.mappings().all()
 
     async def add_messages(
         self,
         session: AsyncSession,
         session_id: UUID,
         messages: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
-        """Add messages to a chat session. Returns empty list if session not found/deleted."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None or chat_session.deleted_at is not None:
-            return []
+        *,
+        model: str | None = None,
+        system_prompt: str | None = None,
+        title: str | None = None,
+    ) -> Sequence[RowMapping]:
+        """Add messages to a chat session. Returns empty list if session not found/deleted.
 
-        created = []
-        for message in messages:
-            created.append(
-                ChatMessage(
-                    session_id=session_id,
-                    role=message["role"],
-                    content=message["content"],
-                )
-            )
-        session.add_all(created)
+        Touches updated_at and applies model/system_prompt in the same statement
+        as the INSERT. A title is only applied while the session still has the
+        default title.
+        """
+        if not messages:
+            return []
 
-        # Update session's updated_at timestamp
-        await session.execute(
-            update(ChatSession)
-            .where(ChatSession.id == session_id)
-            .values(updated_at=func.now())
-        )
+        changes = {"model": model, "system_prompt": system_prompt, "title": title}
+        changes = {name: value for name, value in changes.items() if value is not None}
+        params: dict[str, Any] = {
+            "b_session_id": session_id,
+            "b_ids": [uuid4() for _ in messages],
+            "b_roles": [message["role"] for message in messages],
+            "b_contents": [message["content"] for message in messages],
+            **{f"b_{name}": value for name, value in changes.items()},
+        }
+        result = await session.execute(_add_messages_statement(frozenset(changes)), params)
+        created = result.mappings().all()
         await session.commit()
-        return [_message_to_dict(item) for item in created]
+        if created:
+            _session_cache.pop(session_id)
+        return created
 
     async def update_session_metadata(
         self,
@@ -274,19 +366,16 @@ class ChatRepository:
         title: str | None = None,
     ) -> bool:
         """Update session metadata (model, system_prompt, title)."""
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == session_id)
-        )
-        chat_session = result.scalar_one_or_none()
-        if chat_session is None:
-            return False
-
+        values: dict[str, Any] = {}
         if model is not None:
-            chat_session.model = model
+            values["model"] = model
         if system_prompt is not None:
-            chat_session.system_prompt = system_prompt
+            values["system_prompt"] = system_prompt
         if title is not None:
-            chat_session.title = title
+            values["title"] = title
+        if not values:
+            return (
+                await self.get_session(session, session_id, include_deleted=True)
+            ) is not None
 
-        await session.commit()
-        return True
+        return await _update_session(session, session_id, **values) is not None
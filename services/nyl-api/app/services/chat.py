@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..repositories import ChatRepository, ChatStatus
@@ -48,20 +50,16 @@ class ChatService:
         include_deleted: bool = False,
     ) -> dict[str, Any] | None:
         """Get a chat session with all its messages."""
-        chat_session = await self._repo.get_session(
+        return await self._repo.get_session_with_messages(
             self._session, session_id, include_deleted=include_deleted
         )
-        if chat_session is None:
-            return None
-        messages = await self._repo.list_messages(self._session, session_id)
-        return {"session": chat_session, "messages": messages}
 
     async def list_sessions(
         self,
         status: ChatStatus | str = ChatStatus.ACTIVE,
         scope: str | None = None,
         limit: int = 100,
-    ) -> list[dict[str, Any]]:
+    ) -> Sequence[RowMapping]:
         """List chat sessions with status and optional scope filtering."""
         return await self._repo.list_sessions(
             self._session, status=status, scope=scope, limit=limit
@@ -73,7 +71,7 @@ class ChatService:
         messages: list[dict[str, Any]],
         model: str | None = None,
         system_prompt: str | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> Sequence[RowMapping]:
         """
         Add messages to a chat session.
 
@@ -81,40 +79,22 @@ class ChatService:
         - Auto-generating title from first user message if title is "New chat"
         - Updating model/system_prompt if provided
         """
-        # First add the messages
-        created = await self._repo.add_messages(self._session, session_id, messages)
-        if not created:
-            return []
-
-        # Get session to check if we need to update title
-        chat_session = await self._repo.get_session(self._session, session_id)
-        if chat_session is None:
-            return created
-
-        # Determine if we should update metadata
-        should_update_title = False
         new_title = None
-
-        if chat_session["title"].strip().lower() == "new chat":
-            for message in messages:
-                if message["role"] == "user":
-                    title_text = message["content"].strip()
-                    if title_text:
-                        new_title = title_text[:80]
-                        should_update_title = True
-                    break
-
-        # Update metadata if needed
-        if model is not None or system_prompt is not None or should_update_title:
-            await self._repo.update_session_metadata(
-                self._session,
-                session_id,
-                model=model,
-                system_prompt=system_prompt,
-                title=new_title if should_update_title else None,
-            )
-
-        return created
+        for message in messages:
+            if message["role"] == "user":
+                title_text = message["content"].strip()
+                if title_text:
+                    new_title = title_text[:80]
+                break
+
+        return await self._repo.add_messages(
+            self._session,
+            session_id,
+            messages,
+            model=model,
+            system_prompt=system_prompt,
+            title=new_title,
+        )
 
     async def archive_session(self, session_id: UUID) -> dict[str, Any] | None:
         """Archive a chat session."""
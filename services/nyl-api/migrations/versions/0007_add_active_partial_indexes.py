@@ -0,0 +1,37 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_active_partial_indexes"
+down_revision = "0006_chat_scope"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "journal_entries_active_scope_date_idx",
+        "journal_entries",
+        ["scope", sa.text("journal_date DESC"), sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_deleted IS false"),
+    )
+    op.create_index(
+        "chat_sessions_active_updated_idx",
+        "chat_sessions",
+        [sa.text("updated_at DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL AND archived_at IS NULL"),
+    )
+    # Superseded by the partial index above; updated_at changes on every
+    # chat turn, so a second full index on it is pure write cost.
+    op.drop_index("chat_sessions_scope_updated_idx", table_name="chat_sessions", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        "chat_sessions_scope_updated_idx",
+        "chat_sessions",
+        ["scope", "updated_at"],
+        if_not_exists=True,
+    )
+    op.drop_index("chat_sessions_active_updated_idx", table_name="chat_sessions")
+    op.drop_index("journal_entries_active_scope_date_idx", table_name="journal_entries")
@@ -0,0 +1,34 @@
+from alembic import op
+
+
+revision = "0008_halfvec_embeddings"
+down_revision = "0007_active_partial_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # halfvec needs pgvector >= 0.7 (bundled with pgvector/pgvector:pg16).
+    op.drop_index("journal_entries_embedding_idx", table_name="journal_entries")
+    op.execute(
+        "ALTER TABLE journal_entries "
+        "ALTER COLUMN embedding TYPE halfvec(768) USING embedding::halfvec(768)"
+    )
+    op.execute(
+        "CREATE INDEX journal_entries_embedding_idx "
+        "ON journal_entries "
+        "USING hnsw (embedding halfvec_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("journal_entries_embedding_idx", table_name="journal_entries")
+    op.execute(
+        "ALTER TABLE journal_entries "
+        "ALTER COLUMN embedding TYPE vector(768) USING embedding::vector(768)"
+    )
+    op.execute(
+        "CREATE INDEX journal_entries_embedding_idx "
+        "ON journal_entries "
+        "USING hnsw (embedding vector_cosine_ops)"
+    )
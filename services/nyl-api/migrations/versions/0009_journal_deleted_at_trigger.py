@@ -0,0 +1,34 @@
+from alembic import op
+
+
+revision = "0009_journal_deleted_at_trigger"
+down_revision = "0008_halfvec_embeddings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION journal_entries_stamp_deleted_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.is_deleted AND NOT OLD.is_deleted THEN
+                NEW.deleted_at := now();
+            ELSIF NOT NEW.is_deleted THEN
+                NEW.deleted_at := NULL;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER journal_entries_stamp_deleted_at "
+        "BEFORE UPDATE OF is_deleted ON journal_entries "
+        "FOR EACH ROW EXECUTE FUNCTION journal_entries_stamp_deleted_at()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER journal_entries_stamp_deleted_at ON journal_entries")
+    op.execute("DROP FUNCTION journal_entries_stamp_deleted_at()")
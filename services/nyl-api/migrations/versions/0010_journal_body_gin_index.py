@@ -0,0 +1,31 @@
+from alembic import op
+
+
+revision = "0010_journal_body_gin_index"
+down_revision = "0009_journal_deleted_at_trigger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "journal_entries_body_gin_idx",
+            "journal_entries",
+            ["body"],
+            postgresql_using="gin",
+            postgresql_ops={"body": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "journal_entries_body_gin_idx",
+            table_name="journal_entries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,35 @@
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+revision = "0011_journal_text_body"
+down_revision = "0010_journal_body_gin_index"
+branch_labels = None
+depends_on = None
+
+TEXT_BODY_EXPRESSION = (
+    "to_tsvector('simple', jsonb_path_query_array(body, 'strict $.**.text')::text)"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "journal_entries",
+        sa.Column(
+            "text_body",
+            TSVECTOR(),
+            sa.Computed(TEXT_BODY_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index(
+        "journal_entries_text_body_idx",
+        "journal_entries",
+        ["text_body"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("journal_entries_text_body_idx", table_name="journal_entries")
+    op.drop_column("journal_entries", "text_body")
@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_journal_body_hash"
+down_revision = "0011_journal_text_body"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable and unbackfilled: a NULL hash never matches, so the first
+    # update of an existing row simply writes the body and its hash.
+    op.add_column("journal_entries", sa.Column("body_hash", sa.LargeBinary()))
+
+
+def downgrade() -> None:
+    op.drop_column("journal_entries", "body_hash")
@@ -0,0 +1,77 @@
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013_embedding_hnsw_tuned"
+down_revision = "0012_journal_body_hash"
+branch_labels = None
+depends_on = None
+
+# Session settings for the index build. The defaults match a stock Postgres
+# container: a small maintenance_work_mem and a serial build, since parallel
+# HNSW builds allocate from /dev/shm, which is only 64MB by default.
+BUILD_SETTINGS = {
+    "maintenance_work_mem": os.getenv("HNSW_BUILD_MAINTENANCE_WORK_MEM", "64MB"),
+    "max_parallel_maintenance_workers": os.getenv("HNSW_BUILD_PARALLEL_WORKERS", "0"),
+}
+
+
+def _set_build_settings() -> None:
+    for name, value in BUILD_SETTINGS.items():
+        op.execute(
+            sa.text("SELECT set_config(:name, :value, false)").bindparams(name=name, value=value)
+        )
+
+
+def _reset_build_settings() -> None:
+    # Session-level, so reset before later migrations reuse the connection.
+    for name in BUILD_SETTINGS:
+        op.execute(f"RESET {name}")
+
+
+def upgrade() -> None:
+    # Build the tuned index next to the old one so searches never lose
+    # their index, then drop the default-parameter one. CONCURRENTLY
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        _set_build_settings()
+        try:
+            op.create_index(
+                "journal_entries_embedding_hnsw_idx",
+                "journal_entries",
+                ["embedding"],
+                postgresql_using="hnsw",
+                postgresql_ops={"embedding": "halfvec_cosine_ops"},
+                postgresql_with={"m": 24, "ef_construction": 128},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        finally:
+            _reset_build_settings()
+        op.drop_index(
+            "journal_entries_embedding_idx",
+            table_name="journal_entries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "journal_entries_embedding_idx",
+            "journal_entries",
+            ["embedding"],
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "journal_entries_embedding_hnsw_idx",
+            table_name="journal_entries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
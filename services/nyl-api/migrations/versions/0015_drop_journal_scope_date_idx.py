@@ -0,0 +1,32 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015_drop_scope_date_idx"
+down_revision = "0014_embedding_hnsw_active"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (scope, journal_date) is unique, so journal_entries_scope_date_key
+    # already serves every scope lookup and date ordering this index did;
+    # live-entry listings use journal_entries_active_scope_date_idx.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "journal_entries_scope_date_idx",
+            table_name="journal_entries",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "journal_entries_scope_date_idx",
+            "journal_entries",
+            ["scope", sa.text("journal_date DESC"), sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
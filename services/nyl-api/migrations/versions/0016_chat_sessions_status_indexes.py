@@ -0,0 +1,74 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0016_chat_status_indexes"
+down_revision = "0015_drop_scope_date_idx"
+branch_labels = None
+depends_on = None
+
+# Predicates match chat_status_filters exactly so the planner can use them.
+_INDEXES = (
+    (
+        "chat_sessions_active_scope_updated_idx",
+        ["scope", sa.text("updated_at DESC")],
+        "deleted_at IS NULL AND archived_at IS NULL",
+    ),
+    (
+        "chat_sessions_archived_updated_idx",
+        [sa.text("updated_at DESC")],
+        "deleted_at IS NULL AND archived_at IS NOT NULL",
+    ),
+    (
+        "chat_sessions_deleted_updated_idx",
+        [sa.text("updated_at DESC")],
+        "deleted_at IS NOT NULL",
+    ),
+)
+# Superseded by the scoped active index: unscoped active listings read the
+# same rows from it and sort them, which is cheap for the active set, and
+# updated_at changes on every chat turn, so one active index is one write.
+_ACTIVE_UPDATED_IDX = (
+    "chat_sessions_active_updated_idx",
+    [sa.text("updated_at DESC")],
+    "deleted_at IS NULL AND archived_at IS NULL",
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in _INDEXES:
+            op.create_index(
+                name,
+                "chat_sessions",
+                columns,
+                postgresql_where=sa.text(where),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.drop_index(
+            _ACTIVE_UPDATED_IDX[0],
+            table_name="chat_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        name, columns, where = _ACTIVE_UPDATED_IDX
+        op.create_index(
+            name,
+            "chat_sessions",
+            columns,
+            postgresql_where=sa.text(where),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, _, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name="chat_sessions",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
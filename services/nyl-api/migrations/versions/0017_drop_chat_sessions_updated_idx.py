@@ -0,0 +1,31 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0017_drop_chat_updated_idx"
+down_revision = "0016_chat_status_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every list_sessions status now has a partial index from 0016, so the
+    # full updated_at index only added a write to each chat turn's update.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "chat_sessions_updated_idx",
+            table_name="chat_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "chat_sessions_updated_idx",
+            "chat_sessions",
+            [sa.text("updated_at")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -0,0 +1,25 @@
+import app.cache as cache
+from app.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    lru = TTLCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    lru = TTLCache(maxsize=4, ttl=5)
+    lru.set("a", 1)
+    now[0] += 4
+    assert lru.get("a") == 1
+    now[0] += 2
+    assert lru.get("a") is None
+    assert len(lru) == 0
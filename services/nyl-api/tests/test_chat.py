@@ -38,11 +38,46 @@ async def test_chat_stream_basic():
             chunks.append(chunk.decode())
 
     assert chunks[0].startswith("data: {")
-    assert "\"role\": \"assistant\"" in chunks[0]
+    first = json.loads(chunks[0].removeprefix("data: "))
+    assert first["choices"][0]["delta"]["role"] == "assistant"
     assert any("Hello" in chunk for chunk in chunks)
     assert chunks[-1] == "data: [DONE]\n\n"
 
 
+@pytest.mark.asyncio
+async def test_chat_stream_coalesces_lines_per_read():
+    lines = b"".join(
+        json.dumps(item).encode() + b"\n"
+        for item in [
+            {"message": {"role": "assistant", "content": "Hel"}, "done": False},
+            {"message": {"role": "assistant", "content": "lo"}, "done": False},
+            {"message": {"role": "assistant", "content": ""}, "done": True},
+        ]
+    )
+    split = lines.index(b"lo") - 5
+
+    class SplitStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield lines[:split]
+            yield lines[split:]
+
+    transport = build_mock_transport(lambda request: httpx.Response(200, stream=SplitStream()))
+    request = ChatRequest(
+        model="llama3.1:8b",
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+    )
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://ollama") as async_client:
+        chunks = [chunk async for chunk in stream_chat(request, async_client)]
+
+    assert len(chunks) == 3
+    frames = [frame for chunk in chunks[:-1] for frame in chunk.split(b"\n\n") if frame]
+    deltas = [json.loads(frame.removeprefix(b"data: "))["choices"][0]["delta"] for frame in frames]
+    assert "".join(delta.get("content", "") for delta in deltas) == "Hello"
+    assert chunks[-1] == b"data: [DONE]\n\n"
+
+
 @pytest.mark.asyncio
 async def test_chat_endpoint_stream():
     def handler(request: httpx.Request) -> httpx.Response:
@@ -0,0 +1,40 @@
+import pytest
+
+from app.database import to_async_url
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("postgresql+asyncpg://nyl@postgres/nyl", "postgresql+asyncpg://nyl@postgres/nyl"),
+        ("postgresql://nyl@postgres/nyl", "postgresql+asyncpg://nyl@postgres/nyl"),
+        ("postgres://nyl@postgres/nyl", "postgresql+asyncpg://nyl@postgres/nyl"),
+        ("sqlite:///nyl.db", "sqlite:///nyl.db"),
+    ],
+)
+def test_to_async_url(url, expected):
+    assert to_async_url(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_startup_db_retries_until_pool_is_ready(monkeypatch):
+    import app.database as database
+
+    attempts = []
+    delays = []
+
+    async def flaky_prime_pool():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("postgres is starting")
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(database, "_prime_pool", flaky_prime_pool)
+    monkeypatch.setattr(database.asyncio, "sleep", fake_sleep)
+    await database.startup_db()
+
+    assert len(attempts) == 3
+    assert len(delays) == 2
+    assert all(0 <= delay <= database.DB_CONNECT_MAX_DELAY for delay in delays)
@@ -1,7 +1,9 @@
+import json
 from datetime import date, datetime, timezone
 from uuid import uuid4
 
 import pytest
+from fastapi.testclient import TestClient
 from pydantic import ValidationError
 
 import app.main as main
@@ -25,6 +27,7 @@ async def test_create_journal_entry(monkeypatch):
         }
 
     monkeypatch.setattr(main, "create_journal_entry", fake_create_journal_entry)
+    monkeypatch.setattr(main, "enqueue_ingest", lambda entry: None)
     payload = JournalEntryCreate(
         journal_date=date(2024, 1, 1),
         scope="daily",
@@ -33,9 +36,49 @@ async def test_create_journal_entry(monkeypatch):
         tags=["routine"],
     )
 
-    data = await main.create_entry(payload, pool=object())
-    assert str(data["id"]) == str(entry_id)
+    response = await main.create_entry(payload, session=object())
+    data = json.loads(response.body)
+    assert data["id"] == str(entry_id)
     assert data["scope"] == "daily"
+    assert data["created_at"] == "2024-01-01T12:00:00Z"
+    assert data["is_deleted"] is False
+
+
+@pytest.mark.asyncio
+async def test_create_journal_entry_conflict(monkeypatch):
+    async def fake_create_journal_entry(**kwargs):
+        return None
+
+    monkeypatch.setattr(main, "create_journal_entry", fake_create_journal_entry)
+    payload = JournalEntryCreate(
+        journal_date=date(2024, 1, 1), scope="daily", body={"type": "doc", "content": []}
+    )
+    with pytest.raises(main.HTTPException) as exc_info:
+        await main.create_entry(payload, session=object())
+    assert exc_info.value.status_code == 409
+
+
+def test_create_journal_entries_batch(monkeypatch):
+    async def fake_create_journal_entries(*, session, entries):
+        return [{"id": uuid4(), "created_at": None, **entry} for entry in entries[:1]]
+
+    ingested = []
+    monkeypatch.setattr(main, "create_journal_entries", fake_create_journal_entries)
+    monkeypatch.setattr(main, "enqueue_ingest", ingested.append)
+    main.app.dependency_overrides[main.get_session] = lambda: object()
+    try:
+        client = TestClient(main.app)
+        body = {"journal_date": "2024-01-01", "scope": "daily", "body": {"type": "doc"}}
+        response = client.post("/v1/journal/entries/batch", json=[body, body])
+        assert response.status_code == 200
+        assert [entry["scope"] for entry in response.json()] == ["daily"]
+        assert len(ingested) == 1
+
+        invalid = client.post("/v1/journal/entries/batch", json=[{**body, "scope": "nope"}])
+        assert invalid.status_code == 422
+        assert invalid.json()["detail"][0]["loc"][:3] == ["body", 0, "scope"]
+    finally:
+        main.app.dependency_overrides.clear()
 
 
 @pytest.mark.asyncio
@@ -57,7 +100,10 @@ async def test_list_journal_entries(monkeypatch):
         return entries
 
     monkeypatch.setattr(main, "list_journal_entries", fake_list_journal_entries)
-    data = await main.list_entries(scope="project:nyl", limit=10, pool=object())
+    response = await main.list_entries(
+        scope="project:nyl", limit=10, status="active", session=object()
+    )
+    data = json.loads(response.body)
     assert data[0]["scope"] == "project:nyl"
 
 
@@ -68,10 +114,140 @@ async def test_get_journal_entry_not_found(monkeypatch):
 
     monkeypatch.setattr(main, "get_journal_entry", fake_get_journal_entry)
     with pytest.raises(main.HTTPException) as exc_info:
-        await main.get_entry(uuid4(), pool=object())
+        await main.get_entry(uuid4(), include_deleted=False, if_none_match=None, session=object())
     assert exc_info.value.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_get_journal_entry_not_modified(monkeypatch):
+    entry = {
+        "id": uuid4(),
+        "created_at": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        "journal_date": date(2024, 1, 1),
+        "scope": "daily",
+        "title": "Morning",
+        "body": {"type": "doc", "content": []},
+        "tags": None,
+    }
+
+    async def fake_get_journal_entry(*args, **kwargs):
+        return dict(entry)
+
+    monkeypatch.setattr(main, "get_journal_entry", fake_get_journal_entry)
+    response = await main.get_entry(
+        entry["id"], include_deleted=False, if_none_match=None, session=object()
+    )
+    etag = response.headers["etag"]
+    assert json.loads(response.body)["title"] == "Morning"
+
+    cached = await main.get_entry(
+        entry["id"], include_deleted=False, if_none_match=etag, session=object()
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_update_journal_entry_pruned(monkeypatch):
+    async def fake_update_journal_entry(**kwargs):
+        return {"id": kwargs["entry_id"], "scope": "daily", "title": "", "is_deleted": True}, True
+
+    ingested = []
+    monkeypatch.setattr(main, "update_journal_entry", fake_update_journal_entry)
+    monkeypatch.setattr(main, "enqueue_ingest", ingested.append)
+    response = await main.update_entry(
+        uuid4(), main.JournalEntryUpdate(title=""), session=object()
+    )
+    assert response.status_code == 204
+    assert ingested == []
+
+
+@pytest.mark.asyncio
+async def test_ensure_journal_entry_revived(monkeypatch):
+    entry = {
+        "id": uuid4(),
+        "created_at": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        "journal_date": date(2024, 1, 1),
+        "scope": "daily",
+        "title": "Morning",
+        "body": {"type": "doc", "content": []},
+        "tags": [],
+        "is_deleted": False,
+    }
+
+    async def fake_ensure_journal_entry(**kwargs):
+        return entry, False, True
+
+    ingested = []
+    cleared = []
+    monkeypatch.setattr(main, "ensure_journal_entry", fake_ensure_journal_entry)
+    monkeypatch.setattr(main, "enqueue_ingest", ingested.append)
+    monkeypatch.setattr(main, "clear_context_cache", lambda scopes=None: cleared.append(scopes))
+    payload = main.JournalEntryEnsure(
+        journal_date=date(2024, 1, 1), scope="daily", body={"type": "doc", "content": []}
+    )
+    await main.ensure_entry(payload, session=object())
+    assert ingested == [entry]
+    assert cleared == [{"daily"}]
+
+
+@pytest.mark.asyncio
+async def test_ensure_journal_entry_existing_keeps_scopes_cached(monkeypatch):
+    entry = {
+        "id": uuid4(),
+        "created_at": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        "journal_date": date(2024, 1, 1),
+        "scope": "daily",
+        "title": None,
+        "body": {"type": "doc", "content": []},
+        "tags": None,
+    }
+
+    async def fake_ensure_journal_entry(**kwargs):
+        return entry, False, False
+
+    monkeypatch.setattr(main, "ensure_journal_entry", fake_ensure_journal_entry)
+    main._poll_cache.set("scopes", ('"etag"', b"[]"))
+    payload = main.JournalEntryEnsure(
+        journal_date=date(2024, 1, 1), scope="daily", body={"type": "doc", "content": []}
+    )
+    await main.ensure_entry(payload, session=object())
+    assert main._poll_cache.get("scopes") is not None
+    main._poll_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_delete_journal_entry_clears_its_scope(monkeypatch):
+    async def fake_delete_journal_entry(session, entry_id):
+        return "project:nyl"
+
+    cleared = []
+    monkeypatch.setattr(main, "delete_journal_entry", fake_delete_journal_entry)
+    monkeypatch.setattr(main, "clear_context_cache", lambda scopes=None: cleared.append(scopes))
+    await main.delete_entry(uuid4(), session=object())
+    assert cleared == [{"project:nyl"}]
+
+
+@pytest.mark.asyncio
+async def test_list_scopes_cached_with_etag(monkeypatch):
+    calls = []
+
+    async def fake_list_journal_scopes(**kwargs):
+        calls.append(kwargs)
+        return ["daily", "project:nyl"]
+
+    monkeypatch.setattr(main, "list_journal_scopes", fake_list_journal_scopes)
+    main._poll_cache.clear()
+    response = await main.list_scopes(if_none_match=None, session=object())
+    assert json.loads(response.body) == ["daily", "project:nyl"]
+    etag = response.headers["etag"]
+
+    cached = await main.list_scopes(if_none_match=etag, session=object())
+    assert cached.status_code == 304
+    assert len(calls) == 1
+    main._poll_cache.clear()
+
+
 def test_scope_validation():
     with pytest.raises(ValidationError):
         JournalEntryCreate(
@@ -81,3 +257,54 @@ def test_scope_validation():
             body={"type": "doc", "content": []},
             tags=None,
         )
+
+
+@pytest.mark.asyncio
+async def test_ensure_journal_entry_existing_is_one_round_trip():
+    from types import SimpleNamespace
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.db import ensure_journal_entry
+
+    statements = []
+    existing = SimpleNamespace(
+        id=uuid4(),
+        created_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        journal_date=date(2024, 1, 1),
+        scope="daily",
+        title="Morning",
+        body={"type": "doc", "content": []},
+        tags=None,
+        is_deleted=False,
+        deleted_at=None,
+        embedding_model=None,
+        content_hash=None,
+        written=False,
+    )
+
+    class Result:
+        def one_or_none(self):
+            return existing
+
+    class FakeSession:
+        async def execute(self, stmt):
+            statements.append(str(stmt.compile(dialect=postgresql.asyncpg.dialect())))
+            return Result()
+
+        async def commit(self):
+            pass
+
+    entry, inserted, revived = await ensure_journal_entry(
+        session=FakeSession(),
+        journal_date=date(2024, 1, 1),
+        scope="daily",
+        title=None,
+        body={"type": "doc", "content": []},
+        tags=None,
+    )
+    assert entry["id"] == existing.id
+    assert (inserted, revived) == (False, False)
+    assert len(statements) == 1
+    assert "WHERE journal_entries.is_deleted RETURNING" in statements[0]
+    assert "UNION ALL" in statements[0]
@@ -0,0 +1,31 @@
+from app.journal_text import extract_journal_text
+
+
+def _text(value: str) -> dict:
+    return {"type": "text", "text": value}
+
+
+def test_extract_journal_text_walks_nested_blocks():
+    body = {
+        "type": "doc",
+        "content": [
+            {"type": "heading", "content": [_text("Today  ")]},
+            {
+                "type": "bulletList",
+                "content": [
+                    {"type": "listItem", "content": [{"type": "paragraph", "content": [_text("one")]}]},
+                    {"type": "listItem", "content": [{"type": "paragraph", "content": [_text("two")]}]},
+                ],
+            },
+            {"type": "paragraph", "content": [_text("a"), {"type": "hardBreak"}, _text("b")]},
+            {"type": "paragraph"},
+        ],
+    }
+
+    assert extract_journal_text(body) == "Today\none\ntwo\na\nb"
+
+
+def test_extract_journal_text_handles_empty_bodies():
+    assert extract_journal_text(None) == ""
+    assert extract_journal_text({}) == ""
+    assert extract_journal_text({"type": "doc", "content": None}) == ""
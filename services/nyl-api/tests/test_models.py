@@ -1,14 +1,20 @@
+import json
+
 import httpx
 import pytest
 
-from app.ollama import list_models
+import app.main as main
+from app.ollama import clear_models_cache, embed_texts, list_embedding_models, list_models
 from tests.utils import build_mock_transport
 
 
 @pytest.mark.asyncio
 async def test_list_models():
+    calls = []
+
     def handler(request: httpx.Request) -> httpx.Response:
         assert request.url.path == "/api/tags"
+        calls.append(request)
         return httpx.Response(
             200,
             json={
@@ -23,7 +29,49 @@ async def test_list_models():
         )
 
     transport = build_mock_transport(handler)
+    clear_models_cache()
     async with httpx.AsyncClient(transport=transport, base_url="http://ollama") as async_client:
         data = await list_models(async_client)
+        await list_embedding_models(async_client)
+    clear_models_cache()
 
     assert data["models"][0]["id"] == "llama3.1:8b"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_models_routes_not_modified():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"models": [{"name": "nomic-embed-text"}]})
+
+    transport = build_mock_transport(handler)
+    clear_models_cache()
+    async with httpx.AsyncClient(transport=transport, base_url="http://ollama") as async_client:
+        for route in (main.models, main.embedding_models):
+            response = await route(if_none_match=None, client=async_client)
+            etag = response.headers["etag"]
+            assert json.loads(response.body)
+            cached = await route(if_none_match=etag, client=async_client)
+            assert cached.status_code == 304
+            assert cached.headers["etag"] == etag
+    clear_models_cache()
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_falls_back_to_legacy_endpoint():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/api/embed":
+            return httpx.Response(404, text="404 page not found")
+        prompt = json.loads(request.content)["prompt"]
+        return httpx.Response(200, json={"embedding": [float(len(prompt))]})
+
+    transport = build_mock_transport(handler)
+    async with httpx.AsyncClient(transport=transport, base_url="http://ollama") as async_client:
+        vectors = await embed_texts(["a", "bb"], model="embed", client=async_client)
+
+    assert vectors == [[1.0], [2.0]]
+    assert paths[0] == "/api/embed"
+    assert sorted(paths[1:]) == ["/api/embeddings", "/api/embeddings"]
@@ -0,0 +1,140 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+import app.rag_chat as rag_chat
+from app.schemas import ChatRequest
+
+
+@pytest.mark.asyncio
+async def test_apply_rag_context_caches_repeated_queries(monkeypatch):
+    calls = []
+
+    async def fake_embed_text(text, model, client):
+        calls.append(text)
+        return [0.0]
+
+    async def fake_search(
+        session, embedding, top_k, scope=None, ef_search=None, statement_timeout_ms=None
+    ):
+        assert ef_search == max(40, top_k * rag_chat.HNSW_EF_SEARCH_MULTIPLIER)
+        return [{"id": "e1", "title": "Notes", "journal_date": None, "body": {}}]
+
+    class FakeSession:
+        async def connection(self):
+            return None
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(rag_chat, "embed_text", fake_embed_text)
+    monkeypatch.setattr(rag_chat, "get_ollama_client", lambda: None)
+    monkeypatch.setattr(rag_chat, "search_journal_entries_by_vector", fake_search)
+    monkeypatch.setattr(rag_chat, "SessionLocal", fake_session)
+    rag_chat.clear_context_cache()
+
+    request = ChatRequest(model="m", messages=[{"role": "user", "content": "what  did I do?"}])
+    first = await rag_chat.apply_rag_context(request, "embed")
+    repeat = ChatRequest(model="m", messages=[{"role": "user", "content": "what did I do? "}])
+    second = await rag_chat.apply_rag_context(repeat, "embed")
+
+    assert len(calls) == 1
+    assert first.messages[0].content == second.messages[0].content
+    assert "Notes" in second.messages[0].content
+
+    rag_chat.clear_context_cache()
+    await rag_chat.apply_rag_context(request, "embed")
+    assert len(calls) == 2
+
+
+def test_clear_context_cache_by_scope():
+    rag_chat.clear_context_cache()
+    for scope in ("daily", "project:nyl", None):
+        rag_chat._context_cache.set(("q", "embed", scope, 5), scope)
+
+    rag_chat.clear_context_cache({"daily"})
+
+    assert rag_chat._context_cache.get(("q", "embed", "project:nyl", 5)) == "project:nyl"
+    assert rag_chat._context_cache.get(("q", "embed", "daily", 5)) is None
+    assert rag_chat._context_cache.get(("q", "embed", None, 5)) is None
+    rag_chat.clear_context_cache()
+
+
+def test_inject_context_keeps_the_conversation_prefix_stable():
+    request = ChatRequest(
+        model="m",
+        messages=[
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "ok"},
+            {"role": "user", "content": "second"},
+        ],
+    )
+
+    updated = rag_chat._inject_context(request.messages, "CONTEXT")
+
+    assert updated[:3] == request.messages[:3]
+    assert updated[3].role == "system" and updated[3].content == "CONTEXT"
+    assert updated[4] == request.messages[3]
+
+
+def test_entry_excerpt_cached_by_body_hash(monkeypatch):
+    calls = []
+
+    def fake_extract(body):
+        calls.append(body)
+        return "  walked   the dog "
+
+    monkeypatch.setattr(rag_chat, "extract_journal_text", fake_extract)
+    rag_chat._excerpt_cache.clear()
+    item = {"body": {"type": "doc"}, "body_hash": b"h1"}
+
+    assert rag_chat._entry_excerpt(item) == "walked the dog"
+    assert rag_chat._entry_excerpt(item) == "walked the dog"
+    assert rag_chat._entry_excerpt({"body": {}, "body_hash": None}) == "walked the dog"
+    assert len(calls) == 2
+    rag_chat._excerpt_cache.clear()
+
+
+def test_excerpt_normalizes_beyond_whitespace_heavy_prefix():
+    text = "one" + " " * 2000 + "two  three"
+    assert rag_chat._excerpt(text) == "one two three"
+    long_text = "word " * 200
+    assert rag_chat._excerpt(long_text) == " ".join(["word"] * 56) + "..."
+
+
+@pytest.mark.asyncio
+async def test_scoped_vector_search_falls_back_to_exact_scan():
+    from sqlalchemy.dialects import postgresql
+
+    from app.db import search_journal_entries_by_vector
+
+    statements = []
+
+    class Result:
+        def __init__(self, rows):
+            self._rows = rows
+
+        def mappings(self):
+            return self
+
+        def all(self):
+            return self._rows
+
+    class FakeSession:
+        async def execute(self, stmt):
+            sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+            statements.append(sql)
+            return Result([{"id": 1}] if len(statements) == 1 else [{"id": 1}, {"id": 2}])
+
+    rows = await search_journal_entries_by_vector(
+        FakeSession(), [0.0] * 768, limit=2, scope="daily"
+    )
+
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert all("journal_entries.scope =" in sql for sql in statements)
+    # The first query orders by the bare operator the index serves; the
+    # fallback orders by an expression the index cannot.
+    assert ") +" not in statements[0]
+    assert ") +" in statements[1]
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+import app.rag_ingest as rag_ingest
+
+
+@pytest.mark.asyncio
+async def test_ingest_worker_batches_queued_entries(monkeypatch):
+    batches = []
+    done = asyncio.Event()
+
+    async def fake_ingest(batch):
+        batches.append(batch)
+        done.set()
+
+    monkeypatch.setattr(rag_ingest, "ingest_journal_entries", fake_ingest)
+    monkeypatch.setattr(rag_ingest, "_ingest_queue", asyncio.Queue(maxsize=2))
+    monkeypatch.setattr(rag_ingest, "RAG_INGEST_ON_SAVE", True)
+
+    rag_ingest.enqueue_ingest({"id": 1})
+    rag_ingest.enqueue_ingest({"id": 2})
+    rag_ingest.enqueue_ingest({"id": 3})  # queue full: dropped, not raised
+
+    rag_ingest.start_ingest_workers()
+    try:
+        await asyncio.wait_for(done.wait(), 1)
+    finally:
+        await rag_ingest.stop_ingest_workers()
+
+    assert batches == [[({"id": 1}, None), ({"id": 2}, None)]]
+
+
+@pytest.mark.asyncio
+async def test_build_embedding_rows_batches_chunks_across_entries(monkeypatch):
+    calls = []
+
+    async def fake_embed_texts(texts, model, client):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(rag_ingest, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(rag_ingest, "get_ollama_client", lambda: None)
+    monkeypatch.setattr(rag_ingest, "EMBED_BATCH_SIZE", 2)
+    monkeypatch.setattr(rag_ingest, "_chunk_embeddings", rag_ingest.TTLCache(8, 60))
+    plans = [
+        ({"id": 1, "embedding": None}, ["a", "bbb"]),
+        ({"id": 2, "embedding": None, "content_hash": None}, []),
+        ({"id": 3, "embedding": None}, ["cc", "a"]),
+    ]
+
+    rows = await rag_ingest._build_embedding_rows(plans, "embed")
+
+    # The repeated "a" chunk is embedded once.
+    assert calls == [["a", "bbb"], ["cc"]]
+    # Weighted by chunk length: (1 * 1.0 + 3 * 3.0) / 4 and (2 * 2.0 + 1 * 1.0) / 3.
+    assert [row["embedding"] for row in rows] == [[2.5], None, [pytest.approx(5 / 3)]]
+
+    await rag_ingest._build_embedding_rows([({"id": 4, "embedding": None}, ["bbb"])], "embed")
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_skips_lookup_for_known_unchanged_entry(monkeypatch):
+    lookups = []
+    writes = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def fake_info(session, entry_ids):
+        lookups.append(list(entry_ids))
+        return {}
+
+    async def fake_update(session, rows):
+        writes.append(rows)
+
+    async def fake_embed_texts(texts, model, client):
+        return [[1.0] for _ in texts]
+
+    monkeypatch.setattr(rag_ingest, "ReadSessionLocal", FakeSession)
+    monkeypatch.setattr(rag_ingest, "SessionLocal", FakeSession)
+    monkeypatch.setattr(rag_ingest, "list_journal_entry_embedding_info", fake_info)
+    monkeypatch.setattr(rag_ingest, "update_journal_entry_embeddings", fake_update)
+    monkeypatch.setattr(rag_ingest, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(rag_ingest, "get_ollama_client", lambda: None)
+    monkeypatch.setattr(rag_ingest, "clear_context_cache", lambda scopes=None: None)
+    monkeypatch.setattr(rag_ingest, "_embedding_state", rag_ingest.TTLCache(8, 60))
+    entry = {"id": "e1", "title": "Hello", "body": {}, "tags": []}
+
+    await rag_ingest.ingest_journal_entries([(entry, "embed")])
+    await rag_ingest.ingest_journal_entries([(entry, "embed")])
+
+    assert lookups == [["e1"]]
+    assert len(writes) == 1
+
+
+@pytest.mark.parametrize("name", ["sha-typo", "shake_128"])
+def test_content_hash_algo_rejects_unusable_names(name):
+    with pytest.raises(RuntimeError):
+        rag_ingest._check_content_hash_algo(name)